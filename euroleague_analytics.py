@@ -0,0 +1,328 @@
+"""Analytics shared by the Streamlit app and the JSON query service.
+
+Data is validated and cleaned once at load time (``load_data`` /
+``validate_data``); every other function takes the resulting DataFrame of
+player statistics and returns plain DataFrames or lists, with no Streamlit
+calls, so the same answers can be served to other tools. Heavy dependencies
+(pulp, scikit-learn) are imported inside the function that needs them.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+# Per-36 statistics used by the filters, the radar chart and the similarity search
+PER_36_STATS = ["Points_per_36_minutes", "Assists_per_36_minutes", "Rebounds_per_36_minutes"]
+
+# Selection criteria for underrated players
+UNDERRATED_MIN_TRUE_SHOOTING = 0.55
+UNDERRATED_MIN_POINTS_PER_36 = 10
+UNDERRATED_MIN_ASSIST_TO_TURNOVER = 1.5
+
+# Roster constraints of the team selection optimizer
+ROSTER_SIZE = 12
+ROSTER_MAX_MINUTES = 250
+
+
+# Columns every dataset must provide: text columns and numeric count columns
+TEXT_COLUMNS = ["Player", "Position", "Team"]
+COUNT_COLUMNS = [
+    "Games_played", "Minutes_played", "Points", "Rebounds", "Assists",
+    "Field_goals_made", "Field_goals_attempted", "3_point_field_goals_made",
+    "3_point_field_goals_attempted", "Free_throws_made", "Free_throws_attempted",
+    "Offensive_rebounds", "Defensive_rebounds", "Turnovers", "Steals", "Blocks"
+]
+
+# Made shots can never exceed attempts: (made, attempted) pairs
+SHOT_PAIRS = [
+    ("Field_goals_made", "Field_goals_attempted"),
+    ("3_point_field_goals_made", "3_point_field_goals_attempted"),
+    ("Free_throws_made", "Free_throws_attempted"),
+    ("3_point_field_goals_attempted", "Field_goals_attempted"),
+]
+
+# What a ratio becomes when its denominator is zero:
+#   "nan"   undefined (e.g. shooting percentages of a player with no shots, or
+#           AST/TOV without turnovers, which keeps low-sample players out of
+#           the underrated screen)
+#   "zero"  zero (e.g. shot-profile rates of a player with no field goal attempts)
+# Rows with zero Minutes_played or Games_played are quarantined instead, so the
+# per-36, per-game and VTM metrics are always finite.
+ZERO_DENOMINATOR_POLICIES = {
+    "Effective_Field_Goal_Percentage": "nan",
+    "True_Shooting_Percentage": "nan",
+    "Assist_to_Turnover_Ratio": "nan",
+    "Three_point_attempt_rate": "zero",
+    "Free_throw_attempt_rate": "zero",
+}
+
+DERIVED_COLUMNS = [
+    "Points_per_36_minutes", "Assists_per_36_minutes", "Rebounds_per_36_minutes",
+    "Offensive_rebounds_per_36_minutes", "Defensive_rebounds_per_36_minutes",
+    "Steals_per_36_minutes", "Blocks_per_36_minutes", "Turnovers_per_36_minutes",
+    "Effective_Field_Goal_Percentage", "True_Shooting_Percentage",
+    "Assist_to_Turnover_Ratio", "Three_point_attempt_rate", "Free_throw_attempt_rate",
+    "Minutes_per_Game", "Value_to_Minutes"
+]
+
+
+@dataclass
+class ValidatedData:
+    """Result of the validation stage.
+
+    ``data`` holds the valid rows with the derived metrics, ``quarantined`` the
+    rejected rows with a ``Quarantine_reason`` column, and ``zero_denominators``
+    the number of rows each zero-denominator policy was applied to.
+    """
+    data: pd.DataFrame
+    quarantined: pd.DataFrame
+    zero_denominators: dict
+
+
+def load_data(filepath):
+    """Read an Excel file of player statistics and run the validation stage."""
+    return validate_data(pd.read_excel(filepath))
+
+
+def validate_data(raw):
+    """Check the schema, quarantine invalid rows and add the derived metrics.
+
+    Runs once per dataset, vectorized over all rows. Raises ValueError if
+    required columns are missing. The returned data has correct dtypes, no
+    duplicate players, and finite per-36, per-game and VTM values, so
+    downstream code can use it without further cleaning.
+    """
+    missing = [column for column in TEXT_COLUMNS + COUNT_COLUMNS if column not in raw.columns]
+    if missing:
+        raise ValueError(f"Missing required columns: {', '.join(missing)}")
+
+    data = raw.copy()
+    reasons = pd.Series("", index=data.index)
+
+    def flag(mask, reason):
+        nonlocal reasons
+        reasons = reasons.mask(mask, reasons + reason + "; ")
+
+    for column in TEXT_COLUMNS:
+        values = data[column].astype("string").str.strip()
+        flag(values.isna() | (values == ""), f"missing {column}")
+        data[column] = values.astype(object)
+
+    for column in COUNT_COLUMNS:
+        values = pd.to_numeric(data[column], errors="coerce")
+        flag(values.isna() & data[column].notna(), f"non-numeric {column}")
+        flag(data[column].isna(), f"missing {column}")
+        flag(values < 0, f"negative {column}")
+        flag(values.notna() & (values % 1 != 0), f"non-integer {column}")
+        data[column] = values
+
+    for made, attempted in SHOT_PAIRS:
+        flag(data[made] > data[attempted], f"{made} > {attempted}")
+
+    flag(data["Minutes_played"] == 0, "no minutes played")
+    flag(data["Games_played"] == 0, "no games played")
+    flag(data["Minutes_played"] > data["Games_played"] * 60, "more than 60 minutes per game")
+    flag(data["Player"].duplicated(keep="first") & data["Player"].notna(), "duplicate Player")
+
+    invalid = reasons != ""
+    quarantined = raw[invalid].assign(Quarantine_reason=reasons[invalid].str.rstrip("; "))
+
+    data = data[~invalid].copy()
+    data[COUNT_COLUMNS] = data[COUNT_COLUMNS].astype("int64")
+    data, zero_denominators = add_derived_metrics(data)
+    return ValidatedData(data, quarantined, zero_denominators)
+
+
+def ratio(numerator, denominator, policy="nan"):
+    """Divide two columns, applying a zero-denominator policy instead of inf/NaN."""
+    zero = denominator == 0
+    values = numerator / denominator.mask(zero)
+    if policy == "zero":
+        values = values.mask(zero, 0.0)
+    elif policy != "nan":
+        raise ValueError(f"Unknown zero-denominator policy: {policy}")
+    return values.astype("float64"), int(zero.sum())
+
+
+def add_derived_metrics(data):
+    """Add the per-36, efficiency, shot-profile and VTM columns to validated data.
+
+    Returns the new frame and the number of zero denominators per metric.
+    """
+    data = data.copy()
+    zero_denominators = {}
+
+    # Calculate new statistics with full names
+    data["Points_per_36_minutes"] = (data["Points"] / data["Minutes_played"]) * 36
+    data["Assists_per_36_minutes"] = (data["Assists"] / data["Minutes_played"]) * 36
+    data["Rebounds_per_36_minutes"] = ((data["Offensive_rebounds"] + data["Defensive_rebounds"]) / data["Minutes_played"]) * 36
+    for stat in ["Offensive_rebounds", "Defensive_rebounds", "Steals", "Blocks", "Turnovers"]:
+        data[f"{stat}_per_36_minutes"] = (data[stat] / data["Minutes_played"]) * 36
+    for column, numerator, denominator in [
+        ("Effective_Field_Goal_Percentage", data["Field_goals_made"] + 0.5 * data["3_point_field_goals_made"], data["Field_goals_attempted"]),
+        ("True_Shooting_Percentage", data["Points"], 2 * (data["Field_goals_attempted"] + 0.44 * data["Free_throws_attempted"])),
+        ("Assist_to_Turnover_Ratio", data["Assists"], data["Turnovers"]),
+        ("Three_point_attempt_rate", data["3_point_field_goals_attempted"], data["Field_goals_attempted"]),
+        ("Free_throw_attempt_rate", data["Free_throws_attempted"], data["Field_goals_attempted"]),
+    ]:
+        data[column], zero_denominators[column] = ratio(numerator, denominator, ZERO_DENOMINATOR_POLICIES[column])
+    data['Minutes_per_Game'] = data["Minutes_played"] / data["Games_played"]
+
+    # Calculate Value-to-Minutes (Value_to_Minutes)
+    data["Value_to_Minutes"] = (data["Points_per_36_minutes"] + data["Assists_per_36_minutes"] + data["Rebounds_per_36_minutes"]) / data["Minutes_played"]
+    return data, zero_denominators
+
+
+def filter_players(data, teams=None, positions=None, players=None, pts_min=None, reb_min=None, ast_min=None, minutes_range=None, archetypes=None):
+    """Apply the search filters of the sidebar. Filters left as None are ignored.
+
+    Filtering by archetype requires the ``Archetype`` column (see ``add_archetypes``).
+    """
+    mask = pd.Series(True, index=data.index)
+    if pts_min is not None:
+        mask &= data["Points_per_36_minutes"] >= pts_min
+    if reb_min is not None:
+        mask &= data["Rebounds_per_36_minutes"] >= reb_min
+    if ast_min is not None:
+        mask &= data["Assists_per_36_minutes"] >= ast_min
+    if minutes_range is not None:
+        mask &= (data["Minutes_played"] >= minutes_range[0]) & (data["Minutes_played"] <= minutes_range[1])
+    if teams:
+        mask &= data["Team"].isin(teams)
+    if positions:
+        mask &= data["Position"].isin(positions)
+    if players:
+        mask &= data["Player"].isin(players)
+    if archetypes:
+        mask &= data["Archetype"].isin(archetypes)
+    return data[mask]
+
+
+def add_archetypes(data, labels):
+    """Return a copy of the data with the ``Archetype`` column from per-player labels."""
+    return data.assign(Archetype=data["Player"].map(labels))
+
+
+def top_vtm(data, k=30):
+    """Return the k players with the highest Value-to-Minutes (VTM) ratio."""
+    top_vtm_players = data[["Player", "Value_to_Minutes", "Points_per_36_minutes", "Assists_per_36_minutes", "Rebounds_per_36_minutes", "Minutes_played"]]
+    return top_vtm_players.sort_values(by="Value_to_Minutes", ascending=False).head(k)
+
+
+def underrated_players(data):
+    """Return efficient scorers: high TS%, PTS/36 and AST/TOV."""
+    return data[
+        (data["True_Shooting_Percentage"] > UNDERRATED_MIN_TRUE_SHOOTING) &
+        (data["Points_per_36_minutes"] > UNDERRATED_MIN_POINTS_PER_36) &
+        (data["Assist_to_Turnover_Ratio"] > UNDERRATED_MIN_ASSIST_TO_TURNOVER)
+    ]
+
+
+def team_needs(data):
+    """Return the per-team averages and their deviation from the league average.
+
+    A positive ``*_diff`` value means the team is below the average in that
+    statistic, i.e. it needs reinforcement there.
+    """
+    team_stats = data.groupby("Team")[["Points", "Rebounds", "Assists"]].mean()
+    for stat in ["Points", "Rebounds", "Assists"]:
+        team_stats[f"{stat}_diff"] = team_stats[stat].mean() - team_stats[stat]
+    return team_stats
+
+
+def team_archetype_gaps(data, archetypes):
+    """Count the players of each archetype per team and list the missing ones.
+
+    Returns one row per team with a column per archetype (player counts) and a
+    ``Missing_archetypes`` column naming the archetypes the team lacks.
+    """
+    counts = pd.crosstab(data["Team"], data["Archetype"]).reindex(columns=list(archetypes), fill_value=0)
+    missing = counts.eq(0)
+    counts["Missing_archetypes"] = [", ".join(counts.columns[row]) for row in missing.to_numpy()]
+    return counts
+
+
+def optimize_roster(data, pos_constraints, pos_stats, mandatory_players=(), excluded_players=(),
+                    roster_size=ROSTER_SIZE, max_minutes=ROSTER_MAX_MINUTES):
+    """Select the roster that maximizes the chosen statistics per position.
+
+    Parameters
+    ----------
+    data : DataFrame
+        Candidate players from ``validate_data`` (finite per-36 and minutes values).
+    pos_constraints : dict
+        Number of players per position, e.g. ``{"F": 4, "G": 5, "C": 3}``.
+    pos_stats : dict
+        Statistics to maximize per position, e.g. ``{"F": ["Points_per_36_minutes"]}``.
+
+    Returns the selected rows and the solver status ("Optimal", "Infeasible", ...).
+    The selection is empty unless the status is "Optimal".
+    """
+    import pulp
+
+    # Player names are unique after validation, so they index the rows directly
+    players_data = data.set_index("Player")
+    players = players_data.index.tolist()
+
+    # Create the optimization problem
+    prob = pulp.LpProblem("Optimized_Team_Selection", pulp.LpMaximize)
+    player_vars = pulp.LpVariable.dicts("Player", players, cat='Binary')
+
+    # Objective function: Maximize selected statistic per position
+    prob += pulp.lpSum([
+        players_data.at[player, stat] * player_vars[player]
+        for player in players for stat in pos_stats.get(players_data.at[player, "Position"], [])
+    ])
+
+    # Constraint for total playing time (min/gp ≤ max_minutes)
+    prob += pulp.lpSum([players_data.at[player, "Minutes_per_Game"] * player_vars[player] for player in players]) <= max_minutes
+
+    # Constraint to select exactly roster_size players
+    prob += pulp.lpSum([player_vars[player] for player in players]) == roster_size
+
+    # Position constraints
+    for pos, count in pos_constraints.items():
+        prob += pulp.lpSum([player_vars[player] for player in players if players_data.at[player, "Position"] == pos]) == count
+
+    # Constraints for mandatory and excluded players
+    for player in mandatory_players:
+        if player in player_vars:
+            prob += player_vars[player] == 1
+    for player in excluded_players:
+        if player in player_vars:
+            prob += player_vars[player] == 0
+
+    prob.solve(pulp.PULP_CBC_CMD(msg=False))
+    status = pulp.LpStatus[prob.status]
+
+    # Variable values of an infeasible or unbounded problem are not a roster
+    if status != "Optimal":
+        return data.iloc[0:0], status
+
+    selected_players = [player for player in players if player_vars[player].varValue == 1]
+    return data[data["Player"].isin(selected_players)], status
+
+
+def similar_players(data, player, stats=PER_36_STATS, n_neighbors=5):
+    """Return the n players closest to `player` on the standardized stats.
+
+    Returns a list of (player, distance) tuples, closest first, without the
+    player itself.
+    """
+    from sklearn.neighbors import NearestNeighbors
+    from sklearn.preprocessing import StandardScaler
+
+    stats = list(stats)
+    data_normalized = StandardScaler().fit_transform(data[stats])
+
+    # Position of the player's row in data_normalized
+    player_row = np.flatnonzero((data["Player"] == player).to_numpy())[0]
+
+    # One more neighbor than requested, as the player is its own closest match
+    model = NearestNeighbors(n_neighbors=min(n_neighbors + 1, len(data)), metric='euclidean')
+    model.fit(data_normalized)
+    distances, indices = model.kneighbors(data_normalized[[player_row]])
+
+    players = data["Player"].to_numpy()
+    matches = [(players[idx], float(distance)) for idx, distance in zip(indices[0], distances[0]) if players[idx] != player]
+    return matches[:n_neighbors]
@@ -1,9 +1,14 @@
+import os
 import streamlit as st
 import pandas as pd
 import numpy as np
 import plotly.graph_objects as go
 import plotly.express as px
 
+import euroleague_analytics as analytics
+import player_archetypes
+from player_search import PlayerSearchIndex
+
 # Page settings
 st.set_page_config(page_title="Euroleague Player Analysis", layout="wide")
 
@@ -19,11 +24,69 @@ Use advanced statistical analysis and artificial intelligence tools to **identif
 # Add banner image in the sidebar
 st.sidebar.image("dream5.png",  use_container_width=True)
 
-# Load Data
+# Load Data (validated and cleaned once per file version: schema checks, derived metrics, quarantined rows)
 @st.cache_data
-def load_data_from_file(filepath):
-    data = pd.read_excel(filepath)
-    return data
+def load_data_from_file(filepath, modified):
+    return analytics.load_data(filepath)
+
+# Player search index, built once per file version and shared by all sessions
+@st.cache_resource
+def load_player_index(filepath, modified):
+    return PlayerSearchIndex(load_data_from_file(filepath, modified).data["Player"])
+
+# Archetype clustering, fitted once per dataset and number of archetypes on the
+# first version of the file; later versions only update the labels (see below)
+@st.cache_resource
+def load_archetype_model(filepath, n_archetypes, _data):
+    return player_archetypes.fit_archetypes(_data, n_archetypes)
+
+# Number of search results shown per page in the player pickers
+PLAYER_PAGE_SIZE = 20
+
+def reset_page(page_key):
+    st.session_state[page_key] = 1
+
+def player_picker(label, key, search_index, candidates=None, multiple=True, container=st, help=None):
+    """Search box + paginated player selector.
+
+    Only the current page of search results (plus the players already
+    selected) is sent to the browser. `candidates` restricts the choices to
+    the given players. Returns a list of players, or a single player (None if
+    nothing matches) when `multiple` is False.
+    """
+    allowed = None if candidates is None else set(candidates)
+    page_key = f"{key}_page"
+
+    query = container.text_input(
+        f"Search {label}",
+        key=f"{key}_query",
+        placeholder="Name or team, e.g. Mirotic or EA7",
+        on_change=reset_page,
+        args=(page_key,)
+    )
+    results = search_index.search(query, page=st.session_state.get(page_key, 1), page_size=PLAYER_PAGE_SIZE, restrict_to=allowed)
+    if results.pages > 1:
+        st.session_state[page_key] = results.page
+        container.number_input(f"Results page (of {results.pages}, {results.total} players)", min_value=1, max_value=results.pages, step=1, key=page_key)
+
+    if multiple:
+        # Keep earlier selections (from other pages or queries) that are still valid
+        selected = [player for player in st.session_state.get(key, []) if allowed is None or player in allowed]
+        st.session_state[key] = selected
+        options = selected + [player for player in results.players if player not in selected]
+        return container.multiselect(label, options=options, key=key, help=help)
+
+    current = st.session_state.get(key)
+    if current is not None and allowed is not None and current not in allowed:
+        del st.session_state[key]
+        current = None
+    options = list(results.players)
+    if current is not None and current not in options:
+        options.insert(0, current)
+    if not options:
+        container.write("No players match the search.")
+        return None
+    return container.selectbox(label, options=options, key=key, help=help)
 
 # Sidebar to select dataset
 st.sidebar.header("Select Dataset")
@@ -40,7 +103,8 @@ elif selected_dataset == "eurocup_stats.xlsx":
 
 # Load the data
 try:
-    data = load_data_from_file(file_path)
+    file_modified = os.path.getmtime(file_path)
+    validated = load_data_from_file(file_path, file_modified)
 except Exception as e:
     st.error(f"Error loading the file: {e}")
     st.stop()
@@ -51,30 +115,24 @@ st.markdown("""
 
 # Create expanders to show the Excel data like a glossary
 with st.expander("Euroleague Players Statistics (Excel Data)"):
-    st.write(data)  # Display the table from the Excel file
+    st.write(validated.data.drop(columns=analytics.DERIVED_COLUMNS))  # Display the table from the Excel file
 
-# Calculate new statistics with full names
-data["Points_per_36_minutes"] = (data["Points"] / data["Minutes_played"]) * 36
-data["Assists_per_36_minutes"] = (data["Assists"] / data["Minutes_played"]) * 36
-data["Rebounds_per_36_minutes"] = ((data["Offensive_rebounds"] + data["Defensive_rebounds"]) / data["Minutes_played"]) * 36
-data["Effective_Field_Goal_Percentage"] = (data["Field_goals_made"] + 0.5 * data["3_point_field_goals_made"]) / data["Field_goals_attempted"]
-data["True_Shooting_Percentage"] = data["Points"] / (2 * (data["Field_goals_attempted"] + 0.44 * data["Free_throws_attempted"]))
-data["Assist_to_Turnover_Ratio"] = data["Assists"] / data["Turnovers"]
-data['Minutes_per_Game'] = data["Minutes_played"] / data["Games_played"]
+# Rows rejected by the validation stage, with the reason
+if len(validated.quarantined) > 0:
+    with st.expander(f"Data Validation Report ({len(validated.quarantined)} rows excluded)"):
+        st.write(validated.quarantined)
+        st.write("Zero denominators handled per metric:", validated.zero_denominators)
 
-# Calculate Value-to-Minutes (Value_to_Minutes)
-data["Value_to_Minutes"] = (data["Points_per_36_minutes"] + data["Assists_per_36_minutes"] + data["Rebounds_per_36_minutes"]) / data["Minutes_played"]
+# Validated data, with the new statistics (per 36 minutes, shooting efficiency, VTM)
+data = validated.data
 
 # Add filters in the Sidebar
 st.sidebar.header("Search Filters")
 selected_teams = st.sidebar.multiselect("Select Teams", options= list(data["Team"].unique()))
 selected_positions = st.sidebar.multiselect("Select Player Positions", options= list(data["Position"].unique()))
-selected_players = st.sidebar.multiselect("Select Players", options=list(data["Player"].unique()), default=[])
-
+player_search_index = load_player_index(file_path, file_modified)
+selected_players = player_picker("Select Players", "selected_players", player_search_index, container=st.sidebar)
 
-# Clean data to ensure no NaN or infinite values
-data = data.replace([np.inf, -np.inf], np.nan)  # Replace infinities with NaN
-data = data.dropna(subset=["Points_per_36_minutes", "Rebounds_per_36_minutes", "Assists_per_36_minutes"])  # Drop rows with NaN in key columns
 
 
 st.sidebar.header("Advanced Filters")
@@ -108,21 +166,47 @@ min_playtime = st.sidebar.slider(
     key="playtime_slider"
 )
 
-# Apply filters
-filtered_data = data[
-    (data["Points_per_36_minutes"] >= pts_min) &
-    (data["Rebounds_per_36_minutes"] >= reb_min) &
-    (data["Assists_per_36_minutes"] >= ast_min) &
-    (data["Minutes_played"] >= min_playtime[0]) &
-    (data["Minutes_played"] <= min_playtime[1])
+# Sections to render. Hidden sections are skipped entirely, so their heavy
+# dependencies (statsmodels, pulp, scikit-learn) are never imported.
+all_sections = [
+    "Radar Chart",
+    "Regression Charts",
+    "Value-to-Minutes (VTM)",
+    "Underrated Players",
+    "Team Needs Index",
+    "Team Selection Optimization",
+    "Similar Players",
+    "Player Archetypes"
 ]
+st.sidebar.header("Sections")
+# The archetype clustering is opt-in, so a cold start does not pay for the fit
+default_sections = [section for section in all_sections if section != "Player Archetypes"]
+visible_sections = st.sidebar.multiselect("Show Sections", options=all_sections, default=default_sections)
+
+# Player archetypes (clustering), also used by the filters, the radar chart and the Team Needs Index
+archetype_model = None
+selected_archetypes = []
+if "Player Archetypes" in visible_sections:
+    st.sidebar.header("Player Archetypes")
+    n_archetypes = st.sidebar.slider("Number of Archetypes", min_value=3, max_value=12, value=player_archetypes.DEFAULT_ARCHETYPES)
+    archetype_model = load_archetype_model(file_path, n_archetypes, data)
+    # Assign new or changed players of an edited file without refitting
+    archetype_model.update(data)
+    data = analytics.add_archetypes(data, archetype_model.labels)
+    selected_archetypes = st.sidebar.multiselect("Select Archetypes", options=archetype_model.names)
 
-if selected_teams:
-    filtered_data = filtered_data[filtered_data["Team"].isin(selected_teams)]
-if selected_positions:
-    filtered_data = filtered_data[filtered_data["Position"].isin(selected_positions)]
-if selected_players:
-    filtered_data = filtered_data[filtered_data["Player"].isin(selected_players)]
+# Apply filters
+filtered_data = analytics.filter_players(
+    data,
+    teams=selected_teams,
+    positions=selected_positions,
+    players=selected_players,
+    pts_min=pts_min,
+    reb_min=reb_min,
+    ast_min=ast_min,
+    minutes_range=min_playtime,
+    archetypes=selected_archetypes
+)
 
 # Display the filtered data
 #st.dataframe(filtered_data)
@@ -130,150 +214,158 @@ if selected_players:
 
 
 
-st.markdown("""
-    <hr style="height:2px; border:none; color:#1E90FF; background-color:#1E90FF;">
-""", unsafe_allow_html=True)
+if "Radar Chart" in visible_sections:
+    st.markdown("""
+        <hr style="height:2px; border:none; color:#1E90FF; background-color:#1E90FF;">
+    """, unsafe_allow_html=True)
+
+
+
+    # Radar Chart
+    st.subheader("Player Radar Chart")
+    # Description of methodology and purpose
+    st.markdown("""
+        The **Radar Chart** allows us to compare multiple statistical parameters between 
+        different players visually. We use this chart to depict 
+        the overall performance of players based on various metrics like points, assists, rebounds, etc.
+        This methodology helps us understand which players have a stronger skill set, 
+        aiding in the evaluation of undervalued players to build a stronger team.
+    """)
+
+    # If no players are selected, select all players from the filtered data
+    if len(selected_players) == 0:
+        selected_players = filtered_data["Player"].unique()
+
+    radar_data = filtered_data[filtered_data["Player"].isin(selected_players)]
+
+    # Define categories for the Radar Chart
+    categories = ['Points_per_36_minutes', 'Rebounds_per_36_minutes', 'Assists_per_36_minutes']
+
+    # If there are players to compare
+    if len(radar_data) >= 1:
+        fig = go.Figure()
+        for player in radar_data["Player"].unique():
+            player_data = radar_data[radar_data["Player"] == player]
+            values = player_data[categories].values.flatten().tolist()
+            values += values[:1]  # Close the loop in the radar chart
+            angles = list(np.linspace(0, 2 * np.pi, len(categories), endpoint=False))
+            angles += angles[:1]  # Close the loop in the radar chart
+
+            fig.add_trace(go.Scatterpolar(
+                r=values,
+                theta=categories + [categories[0]],
+                fill='toself',
+                name=f"{player} ({player_data['Archetype'].iloc[0]})" if archetype_model is not None else player
+            ))
+
+        fig.update_layout(
+            polar=dict(radialaxis=dict(visible=True)),
+            showlegend=True,
+            title="Player Radar Chart",
+            height=700,
+            width=1000,
+            legend=dict(
+                x=1,
+                y=1,
+                traceorder='normal',
+                font=dict(size=12),
+                bgcolor='rgba(255, 255, 255, 0)',
+                bordercolor='Black',
+                borderwidth=1
+            )
+        )
+        st.plotly_chart(fig)
+    else:
+        st.write("There are no players that meet the filtering criteria.")
 
 
 
-# Radar Chart
-st.subheader("Player Radar Chart")
-# Description of methodology and purpose
-st.markdown("""
-    The **Radar Chart** allows us to compare multiple statistical parameters between 
-    different players visually. We use this chart to depict 
-    the overall performance of players based on various metrics like points, assists, rebounds, etc.
-    This methodology helps us understand which players have a stronger skill set, 
-    aiding in the evaluation of undervalued players to build a stronger team.
-""")
+if "Regression Charts" in visible_sections:
+    st.markdown("""
+        <hr style="height:2px; border:none; color:#1E90FF; background-color:#1E90FF;">
+    """, unsafe_allow_html=True)
 
-# If no players are selected, select all players from the filtered data
-if len(selected_players) == 0:
-    selected_players = filtered_data["Player"].unique()
-
-radar_data = filtered_data[filtered_data["Player"].isin(selected_players)]
-
-# Define categories for the Radar Chart
-categories = ['Points_per_36_minutes', 'Rebounds_per_36_minutes', 'Assists_per_36_minutes']
-
-# If there are players to compare
-if len(radar_data) >= 1:
-    fig = go.Figure()
-    for player in radar_data["Player"].unique():
-        values = radar_data[radar_data["Player"] == player][categories].values.flatten().tolist()
-        values += values[:1]  # Close the loop in the radar chart
-        angles = list(np.linspace(0, 2 * np.pi, len(categories), endpoint=False))
-        angles += angles[:1]  # Close the loop in the radar chart
-        
-        fig.add_trace(go.Scatterpolar(
-            r=values,
-            theta=categories + [categories[0]],
-            fill='toself',
-            name=player
-        ))
 
-    fig.update_layout(
-        polar=dict(radialaxis=dict(visible=True)),
-        showlegend=True,
-        title="Player Radar Chart",
-        height=700,
-        width=1000,
-        legend=dict(
-            x=1,
-            y=1,
-            traceorder='normal',
-            font=dict(size=12),
-            bgcolor='rgba(255, 255, 255, 0)',
-            bordercolor='Black',
-            borderwidth=1
-        )
-    )
-    st.plotly_chart(fig)
-else:
-    st.write("There are no players that meet the filtering criteria.")
 
+    st.subheader("Regression Charts")
+    # Description of methodology and purpose
+    st.markdown("""
+        In this chart, we perform **Regression Analysis** to understand the relationship 
+        between different statistics and other parameters. This analysis helps us understand which parameters affect player 
+        performance most effectively, allowing us to identify undervalued players.
+    """)
 
+    # Create columns for the Regression Charts
+    col1, col2 = st.columns(2)
 
-st.markdown("""
-    <hr style="height:2px; border:none; color:#1E90FF; background-color:#1E90FF;">
-""", unsafe_allow_html=True)
+    # First Regression Chart
+    with col1:
+        # Select axes for the first chart
+        x_axis_1 = st.selectbox(
+            "Select Variable for the Horizontal Axis (Chart 1)",
+            options=filtered_data.columns,
+            index=list(filtered_data.columns).index("Minutes_per_Game")  # Default: "Minutes_per_Game"
+        )
+        y_axis_1 = st.selectbox(
+            "Select Variable for the Vertical Axis (Chart 1)",
+            options=filtered_data.columns,
+            index=list(filtered_data.columns).index("Points_per_36_minutes")  # Default: "Points_per_36_minutes"
+        )
+        fig1 = px.scatter(
+            filtered_data,
+            x=x_axis_1,
+            y=y_axis_1,
+            hover_name="Player",
+            hover_data=["Team", "Position", x_axis_1, y_axis_1],
+            trendline="ols",
+            title=f"Relationship between {x_axis_1} and {y_axis_1}"
+        )
+        fig1.update_layout(
+            xaxis_title=x_axis_1,
+            yaxis_title=y_axis_1,
+            template="plotly_white"
+        )
+        st.plotly_chart(fig1)
+
+    # Second Regression Chart
+    with col2:
+        # Select axes for the second chart
+        x_axis_2 = st.selectbox(
+            "Select Variable for the Horizontal Axis (Chart 2)",
+            options=filtered_data.columns,
+            index=list(filtered_data.columns).index("Minutes_played"),  # Default: "Minutes_played"
+            key="x_axis_2"
+        )
+        y_axis_2 = st.selectbox(
+            "Select Variable for the Vertical Axis (Chart 2)",
+            options=filtered_data.columns,
+            index=list(filtered_data.columns).index("Points"),  # Default: "Points"
+            key="y_axis_2"
+        )
+        fig2 = px.scatter(
+            filtered_data,
+            x=x_axis_2,
+            y=y_axis_2,
+            hover_name="Player",
+            hover_data=["Team", "Position", x_axis_2, y_axis_2],
+            trendline="ols",
+            title=f"Relationship between {x_axis_2} and {y_axis_2}"
+        )
+        fig2.update_layout(
+            xaxis_title=x_axis_2,
+            yaxis_title=y_axis_2,
+            template="plotly_white"
+        )
+        st.plotly_chart(fig2)
 
 
 
-st.subheader("Regression Charts")
-# Description of methodology and purpose
-st.markdown("""
-    In this chart, we perform **Regression Analysis** to understand the relationship 
-    between different statistics and other parameters. This analysis helps us understand which parameters affect player 
-    performance most effectively, allowing us to identify undervalued players.
-""")
+if "Value-to-Minutes (VTM)" in visible_sections:
+    st.markdown("""
+        <hr style="height:2px; border:none; color:#1E90FF; background-color:#1E90FF;">
+    """, unsafe_allow_html=True)
 
-# Create columns for the Regression Charts
-col1, col2 = st.columns(2)
 
-# First Regression Chart
-with col1:
-    # Select axes for the first chart
-    x_axis_1 = st.selectbox(
-        "Select Variable for the Horizontal Axis (Chart 1)",
-        options=filtered_data.columns,
-        index=list(filtered_data.columns).index("Minutes_per_Game")  # Default: "Minutes_per_Game"
-    )
-    y_axis_1 = st.selectbox(
-        "Select Variable for the Vertical Axis (Chart 1)",
-        options=filtered_data.columns,
-        index=list(filtered_data.columns).index("Points_per_36_minutes")  # Default: "Points_per_36_minutes"
-    )
-    fig1 = px.scatter(
-        filtered_data,
-        x=x_axis_1,
-        y=y_axis_1,
-        hover_name="Player",
-        hover_data=["Team", "Position", x_axis_1, y_axis_1],
-        trendline="ols",
-        title=f"Relationship between {x_axis_1} and {y_axis_1}"
-    )
-    fig1.update_layout(
-        xaxis_title=x_axis_1,
-        yaxis_title=y_axis_1,
-        template="plotly_white"
-    )
-    st.plotly_chart(fig1)
-
-# Second Regression Chart
-with col2:
-    # Select axes for the second chart
-    x_axis_2 = st.selectbox(
-        "Select Variable for the Horizontal Axis (Chart 2)",
-        options=filtered_data.columns,
-        index=list(filtered_data.columns).index("Minutes_played"),  # Default: "Minutes_played"
-        key="x_axis_2"
-    )
-    y_axis_2 = st.selectbox(
-        "Select Variable for the Vertical Axis (Chart 2)",
-        options=filtered_data.columns,
-        index=list(filtered_data.columns).index("Points"),  # Default: "Points"
-        key="y_axis_2"
-    )
-    fig2 = px.scatter(
-        filtered_data,
-        x=x_axis_2,
-        y=y_axis_2,
-        hover_name="Player",
-        hover_data=["Team", "Position", x_axis_2, y_axis_2],
-        trendline="ols",
-        title=f"Relationship between {x_axis_2} and {y_axis_2}"
-    )
-    fig2.update_layout(
-        xaxis_title=x_axis_2,
-        yaxis_title=y_axis_2,
-        template="plotly_white"
-    )
-    st.plotly_chart(fig2)
-
-st.markdown("""
-    <hr style="height:2px; border:none; color:#1E90FF; background-color:#1E90FF;">
-""", unsafe_allow_html=True)
 
 
 
@@ -281,482 +373,424 @@ st.markdown("""
 
 
 
+    # Filter for players with the highest Value-to-Minutes (VTM) ratio
+    st.subheader("Top 30 Players with High Value-to-Minutes (VTM)")
+    top_vtm_players = analytics.top_vtm(filtered_data, k=30)
 
-import plotly.express as px
-
-# Filter for players with the highest Value-to-Minutes (VTM) ratio
-st.subheader("Top 30 Players with High Value-to-Minutes (VTM)")
-top_vtm_players = filtered_data[["Player", "Value_to_Minutes", "Points_per_36_minutes", "Assists_per_36_minutes", "Rebounds_per_36_minutes", "Minutes_played"]]
-top_vtm_players = top_vtm_players.sort_values(by="Value_to_Minutes", ascending=False)
+    # Description of methodology and purpose
+    st.markdown("""
+        The **VTM (Value-to-Minutes)** ratio is calculated by dividing the player's statistical performance ("Points_per_36_minutes", "Assists_per_36_minutes", "Rebounds_per_36_minutes") by their total minutes played.
+        This metric helps identify players who deliver high performance in limited playing time, making it useful for spotting undervalued talents.
 
-# Description of methodology and purpose
-st.markdown("""
-    The **VTM (Value-to-Minutes)** ratio is calculated by dividing the player's statistical performance ("Points_per_36_minutes", "Assists_per_36_minutes", "Rebounds_per_36_minutes") by their total minutes played.
-    This metric helps identify players who deliver high performance in limited playing time, making it useful for spotting undervalued talents.
+    """)
 
-""")
+    # Display table with expander
+    with st.expander("See the table of players with the highest VTM ratio", expanded=False):
+        st.write("Players with the highest Value-to-Minutes (VTM) ratio:")
+        st.dataframe(top_vtm_players)
 
-# Display table with expander
-with st.expander("See the table of players with the highest VTM ratio", expanded=False):
-    st.write("Players with the highest Value-to-Minutes (VTM) ratio:")
-    st.dataframe(top_vtm_players.head(30))
-
-# Create Bar Chart for VTM ratio with larger size
-fig_vtm = px.bar(
-    top_vtm_players.head(30), 
-    x="Player", 
-    y="Value_to_Minutes", 
-    title="Top 30 Players with High Value-to-Minutes (VTM)",
-    labels={"Player": "Player", "Value_to_Minutes": "VTM (Value-to-Minutes)"},
-    color="Value_to_Minutes",  # Coloring based on the VTM value
-    color_continuous_scale="Viridis"  # Choose a color scale
-)
+    # Create Bar Chart for VTM ratio with larger size
+    fig_vtm = px.bar(
+        top_vtm_players, 
+        x="Player", 
+        y="Value_to_Minutes", 
+        title="Top 30 Players with High Value-to-Minutes (VTM)",
+        labels={"Player": "Player", "Value_to_Minutes": "VTM (Value-to-Minutes)"},
+        color="Value_to_Minutes",  # Coloring based on the VTM value
+        color_continuous_scale="Viridis"  # Choose a color scale
+    )
 
-# Graph size settings
-fig_vtm.update_layout(
-    height=400,  # Height of the chart
-    width=500,  # Width of the chart
-    font=dict(size=14)  # Font size
-)
+    # Graph size settings
+    fig_vtm.update_layout(
+        height=400,  # Height of the chart
+        width=500,  # Width of the chart
+        font=dict(size=14)  # Font size
+    )
 
-# Display the Bar Chart
-st.plotly_chart(fig_vtm, use_container_width=True)
+    # Display the Bar Chart
+    st.plotly_chart(fig_vtm, use_container_width=True)
 
 
-st.markdown("""
-    <hr style="height:2px; border:none; color:#1E90FF; background-color:#1E90FF;">
-""", unsafe_allow_html=True)
 
+if "Underrated Players" in visible_sections:
+    st.markdown("""
+        <hr style="height:2px; border:none; color:#1E90FF; background-color:#1E90FF;">
+    """, unsafe_allow_html=True)
 
 
 
-# Identifying Underrated Players
-from plotly.subplots import make_subplots
-import plotly.graph_objects as go
-st.subheader("Identifying Underrated Players")
 
-# Description of methodology and purpose
-st.markdown("""
-    In **Identifying Underrated Players**, we focus on players who have high scoring efficiency and strong offensive stats but may be overlooked due to other factors, such as overall play or team role. 
-    The selection criteria for these players are:
-    - **True Shooting Percentage (TS%) > 0.55**
-    - **Points per 36 minutes (PTS/36) > 10**
-    - **Assist-to-Turnover Ratio (AST/TOV) > 1.5**
+    # Identifying Underrated Players
+    from plotly.subplots import make_subplots
+    st.subheader("Identifying Underrated Players")
 
-    These metrics help us highlight players who are efficient and effective, despite potentially receiving limited recognition.
+    # Description of methodology and purpose
+    st.markdown("""
+        In **Identifying Underrated Players**, we focus on players who have high scoring efficiency and strong offensive stats but may be overlooked due to other factors, such as overall play or team role. 
+        The selection criteria for these players are:
+        - **True Shooting Percentage (TS%) > 0.55**
+        - **Points per 36 minutes (PTS/36) > 10**
+        - **Assist-to-Turnover Ratio (AST/TOV) > 1.5**
 
-""")
+        These metrics help us highlight players who are efficient and effective, despite potentially receiving limited recognition.
 
-# Filter for underrated players based on specific criteria
-underrated_players = filtered_data[
-    (filtered_data["True_Shooting_Percentage"] > 0.55) & 
-    (filtered_data["Points_per_36_minutes"] > 10) & 
-    (filtered_data["Assist_to_Turnover_Ratio"] > 1.5)
-]
+    """)
 
-# Create a dropdown with an expander
-with st.expander("Players with high efficiency but underrated:"):
-    st.dataframe(underrated_players[["Player", "Points_per_36_minutes", "True_Shooting_Percentage", "Assist_to_Turnover_Ratio"]])
+    # Filter for underrated players based on specific criteria
+    underrated_players = analytics.underrated_players(filtered_data)
 
-# Sort the underrated players by PTS/36 in descending order
-underrated_players_sorted = underrated_players.sort_values(by="Points_per_36_minutes", ascending=False)
+    # Create a dropdown with an expander
+    with st.expander("Players with high efficiency but underrated:"):
+        st.dataframe(underrated_players[["Player", "Points_per_36_minutes", "True_Shooting_Percentage", "Assist_to_Turnover_Ratio"]])
 
-# Create combined chart (Bar + Line)
-fig_underrated_combined = make_subplots(
-    rows=1, cols=1, 
-    shared_xaxes=True, 
-    vertical_spacing=0.1,
-    subplot_titles=["Underrated Players with High PTS/36 and Performance"]
-)
+    # Sort the underrated players by PTS/36 in descending order
+    underrated_players_sorted = underrated_players.sort_values(by="Points_per_36_minutes", ascending=False)
 
-# Add Bar chart for PTS/36
-fig_underrated_combined.add_trace(
-    go.Bar(
-        x=underrated_players_sorted["Player"], 
-        y=underrated_players_sorted["Points_per_36_minutes"],
-        name="PTS/36",
-        marker=dict(color="blue"),
-        yaxis="y1"
+    # Create combined chart (Bar + Line)
+    fig_underrated_combined = make_subplots(
+        rows=1, cols=1, 
+        shared_xaxes=True, 
+        vertical_spacing=0.1,
+        subplot_titles=["Underrated Players with High PTS/36 and Performance"]
     )
-)
 
-# Add Line chart for TS%
-fig_underrated_combined.add_trace(
-    go.Scatter(
-        x=underrated_players_sorted["Player"], 
-        y=underrated_players_sorted["True_Shooting_Percentage"],
-        name="TS%",
-        mode="lines+markers",
-        line=dict(color="red"),
-        yaxis="y2"
+    # Add Bar chart for PTS/36
+    fig_underrated_combined.add_trace(
+        go.Bar(
+            x=underrated_players_sorted["Player"], 
+            y=underrated_players_sorted["Points_per_36_minutes"],
+            name="PTS/36",
+            marker=dict(color="blue"),
+            yaxis="y1"
+        )
     )
-)
-
-# Update chart settings
-fig_underrated_combined.update_layout(
-    title="Underrated Players with High PTS/36 and Performance",
-    height=500,
-    width=800,
-    xaxis_title="Player",
-    yaxis_title="PTS/36",
-    yaxis2=dict(
-        title="TS%",
-        overlaying="y",
-        side="right"
-    ),
-    template="plotly_white"
-)
 
-# Display the chart
-st.plotly_chart(fig_underrated_combined, use_container_width=True)
+    # Add Line chart for TS%
+    fig_underrated_combined.add_trace(
+        go.Scatter(
+            x=underrated_players_sorted["Player"], 
+            y=underrated_players_sorted["True_Shooting_Percentage"],
+            name="TS%",
+            mode="lines+markers",
+            line=dict(color="red"),
+            yaxis="y2"
+        )
+    )
 
+    # Update chart settings
+    fig_underrated_combined.update_layout(
+        title="Underrated Players with High PTS/36 and Performance",
+        height=500,
+        width=800,
+        xaxis_title="Player",
+        yaxis_title="PTS/36",
+        yaxis2=dict(
+            title="TS%",
+            overlaying="y",
+            side="right"
+        ),
+        template="plotly_white"
+    )
 
+    # Display the chart
+    st.plotly_chart(fig_underrated_combined, use_container_width=True)
 
 
 
+if "Team Needs Index" in visible_sections:
+    st.markdown("""
+        <hr style="height:2px; border:none; color:#1E90FF; background-color:#1E90FF;">
+    """, unsafe_allow_html=True)
 
-st.markdown("""
-    <hr style="height:2px; border:none; color:#1E90FF; background-color:#1E90FF;">
-""", unsafe_allow_html=True)
 
 
 
 
-import plotly.express as px
-import pandas as pd
-import streamlit as st
-
-st.markdown("""
-### Team Needs Index (Deviation from the Average)
+    st.markdown("""
+    ### Team Needs Index (Deviation from the Average)
 
-This tool calculates the **difference** of teams from the average for three key statistics: **Rebounds (REB/36)**, **Assists (AST/36)**, and **Points (PTS/36)**, using player data per team. The results are presented in an **interactive chart** that shows the difference for each team compared to the average for each statistic.
-This tool is useful for analysts and coaches who want to understand each team's weaknesses or needs and identify which areas require reinforcement.
-""")
-
-# Assuming filtered_data is already created correctly
-filtered_data = filtered_data.copy()  # To avoid potential conflicts
+    This tool calculates the **difference** of teams from the average for three key statistics: **Rebounds (REB/36)**, **Assists (AST/36)**, and **Points (PTS/36)**, using player data per team. The results are presented in an **interactive chart** that shows the difference for each team compared to the average for each statistic.
+    This tool is useful for analysts and coaches who want to understand each team's weaknesses or needs and identify which areas require reinforcement.
+    """)
 
-# Create a table with the team's statistics
-team_stats = filtered_data.groupby("Team")[["Points", "Rebounds", "Assists"]].mean()
+    # Create a table with the team's statistics and their deviations from the average
+    team_stats = analytics.team_needs(filtered_data)
 
-# Calculate deviations from the average
-avg_points = team_stats["Points"].mean()
-avg_rebounds = team_stats["Rebounds"].mean()
-avg_assists = team_stats["Assists"].mean()
+    # Create dropdown for selecting the statistic
+    stat_choice = st.selectbox(
+        "Select Statistic:",
+        ("Points_diff", "Rebounds_diff", "Assists_diff"),
+        index=0  # Default selection
+    )
 
-# Calculate the differences
-team_stats["Points_diff"] = avg_points - team_stats["Points"]
-team_stats["Rebounds_diff"] = avg_rebounds - team_stats["Rebounds"]
-team_stats["Assists_diff"] = avg_assists - team_stats["Assists"]
+    # Convert the table to long format for use with Plotly
+    team_needs_long = team_stats[["Points_diff", "Rebounds_diff", "Assists_diff"]].reset_index()
+    team_needs_long = pd.melt(team_needs_long, id_vars=["Team"], value_vars=["Points_diff", "Rebounds_diff", "Assists_diff"], 
+                              var_name="Statistic", value_name="Difference")
+
+    # Filter based on the selected variable
+    filtered_chart_data = team_needs_long[team_needs_long["Statistic"] == stat_choice]
+
+    # Calculate the standard deviation for the difference
+    std_diff = filtered_chart_data["Difference"].std()
+
+    # Calculate the average difference
+    mean_diff = filtered_chart_data["Difference"].mean()
+
+    # Display the standard deviation and the average
+    #st.write(f"Average Difference: {mean_diff:.2f}")
+    st.write(f"Standard Deviation: {std_diff:.2f}")
+    st.markdown(""" If the difference from the average is less than 1 standard deviation, it is considered normal. If it is greater, the difference exceeds 68% of cases and indicates a significant need for improvement in that area. """)
+
+
+    # Create the bar chart
+    fig = px.bar(filtered_chart_data, 
+                 x="Difference",  # Set "Difference" on the x-axis for horizontal bars
+                 y="Team",  # Set the team on the y-axis
+                 color="Statistic", 
+                 title=f"Team Needs Index (Deviation from the Average): {stat_choice}",
+                 labels={"Difference": "Difference from Average", "Team": "Team"},
+                 hover_data={"Team": True, "Statistic": True, "Difference": True},
+                 orientation="h")  # Horizontal bars
+
+    # Add a line for the average
+    fig.add_vline(
+        x=mean_diff,
+        line=dict(color="blue", dash="dash"),
+        annotation_text="Average",
+        annotation_position="top left"
+    )
 
-# Create dropdown for selecting the statistic
-stat_choice = st.selectbox(
-    "Select Statistic:",
-    ("Points_diff", "Rebounds_diff", "Assists_diff"),
-    index=0  # Default selection
-)
+    # Add lines for 1 standard deviation above/below the average
+    fig.add_vline(
+        x=mean_diff + std_diff,
+        line=dict(color="green", dash="dash"),
+        annotation_text="Average +1 Std Dev",
+        annotation_position="top left"
+    )
 
-# Convert the table to long format for use with Plotly
-team_needs_long = team_stats[["Points_diff", "Rebounds_diff", "Assists_diff"]].reset_index()
-team_needs_long = pd.melt(team_needs_long, id_vars=["Team"], value_vars=["Points_diff", "Rebounds_diff", "Assists_diff"], 
-                          var_name="Statistic", value_name="Difference")
-
-# Filter based on the selected variable
-filtered_chart_data = team_needs_long[team_needs_long["Statistic"] == stat_choice]
-
-# Calculate the standard deviation for the difference
-std_diff = filtered_chart_data["Difference"].std()
-
-# Calculate the average difference
-mean_diff = filtered_chart_data["Difference"].mean()
-
-# Display the standard deviation and the average
-#st.write(f"Average Difference: {mean_diff:.2f}")
-st.write(f"Standard Deviation: {std_diff:.2f}")
-st.markdown(""" If the difference from the average is less than 1 standard deviation, it is considered normal. If it is greater, the difference exceeds 68% of cases and indicates a significant need for improvement in that area. """)
-
-
-# Create the bar chart
-fig = px.bar(filtered_chart_data, 
-             x="Difference",  # Set "Difference" on the x-axis for horizontal bars
-             y="Team",  # Set the team on the y-axis
-             color="Statistic", 
-             title=f"Team Needs Index (Deviation from the Average): {stat_choice}",
-             labels={"Difference": "Difference from Average", "Team": "Team"},
-             hover_data={"Team": True, "Statistic": True, "Difference": True},
-             orientation="h")  # Horizontal bars
-
-# Add a line for the average
-fig.add_vline(
-    x=mean_diff,
-    line=dict(color="blue", dash="dash"),
-    annotation_text="Average",
-    annotation_position="top left"
-)
+    fig.add_vline(
+        x=mean_diff - std_diff,
+        line=dict(color="green", dash="dash"),
+        annotation_text="Average -1 Std Dev",
+        annotation_position="top left"
+    )
 
-# Add lines for 1 standard deviation above/below the average
-fig.add_vline(
-    x=mean_diff + std_diff,
-    line=dict(color="green", dash="dash"),
-    annotation_text="Average +1 Std Dev",
-    annotation_position="top left"
-)
+    # Update chart with larger size
+    fig.update_layout(
+        height=500,  # Increases the height of the chart
+        width=800,  # Increases the width of the chart
+    )
 
-fig.add_vline(
-    x=mean_diff - std_diff,
-    line=dict(color="green", dash="dash"),
-    annotation_text="Average -1 Std Dev",
-    annotation_position="top left"
-)
+    # Display the interactive chart in Streamlit
+    st.plotly_chart(fig)
 
-# Update chart with larger size
-fig.update_layout(
-    height=500,  # Increases the height of the chart
-    width=800,  # Increases the width of the chart
-)
+    # Archetypes each team lacks (counts of players per archetype)
+    if archetype_model is not None:
+        st.markdown("**Missing Player Archetypes per Team**: the number of players of each archetype in every team, and the archetypes the team has no player for.")
+        st.dataframe(analytics.team_archetype_gaps(filtered_data, archetype_model.names))
 
-# Display the interactive chart in Streamlit
-st.plotly_chart(fig)
 
 
+if "Team Selection Optimization" in visible_sections:
+    st.markdown("""
+        <hr style="height:2px; border:none; color:#1E90FF; background-color:#1E90FF;">
+    """, unsafe_allow_html=True)
 
 
 
-st.markdown("""
-    <hr style="height:2px; border:none; color:#1E90FF; background-color:#1E90FF;">
-""", unsafe_allow_html=True)
 
+    st.markdown("""
+    ### Basketball Team Selection Optimization
 
+    This tool optimize a basketball team's roster with the goal of maximizing performance in the statistics the user selects. The process includes:
 
+    1. **Player Filtering**: Selection of players from each position (Forwards, Guards, Centers) and defining the statistics to optimize (e.g., points, assists, rebounds).
+    2. **Constraints**: Setting constraints for position distribution, total playing time (limit of 250 minutes for all players), and team composition.
+    3. **Team Optimization**: Analyzing the data and selecting the best players to maximize the team’s overall performance while ensuring that each player has sufficient playing time.
+    4. **Results**: Displaying the selected players with a table and a chart that shows their statistics.
 
-import pulp
-import numpy as np
-import plotly.express as px
+    This tool offers a mathematical approach for **effective team composition**, ensuring that all players have adequate playing time, and the total playing time does not exceed 250 minutes. It is ideal for coaches, analysts, and sports professionals who want to make more strategic and data-driven player selections.
+    """)
 
-st.markdown("""
-### Basketball Team Selection Optimization
+    # Filters for positions above the table
+    st.markdown("Select Players by Position and Optimization Statistic")
+    fwd_count = st.slider("How many Forwards (F) do you want?", min_value=0, max_value=5, value=4)
+    g_count = st.slider("How many Guards (G) do you want?", min_value=0, max_value=5, value=5)
+    c_count = st.slider("How many Centers (C) do you want?", min_value=0, max_value=5, value=3)
 
-This tool optimize a basketball team's roster with the goal of maximizing performance in the statistics the user selects. The process includes:
+    # Select the statistics to be optimized for each position
+    fwd_stats = st.multiselect("Statistics to Optimize (Forwards)", 
+                               ['Points_per_36_minutes', 'Assists_per_36_minutes', 'Rebounds_per_36_minutes'], 
+                               default=['Points_per_36_minutes'])
+    g_stats = st.multiselect("Statistics to Optimize (Guards)", 
+                             ['Points_per_36_minutes', 'Assists_per_36_minutes', 'Rebounds_per_36_minutes'], 
+                             default=['Points_per_36_minutes'])
+    c_stats = st.multiselect("Statistics to Optimize (Centers)", 
+                             ['Points_per_36_minutes', 'Assists_per_36_minutes', 'Rebounds_per_36_minutes'], 
+                             default=['Points_per_36_minutes'])
 
-1. **Player Filtering**: Selection of players from each position (Forwards, Guards, Centers) and defining the statistics to optimize (e.g., points, assists, rebounds).
-2. **Constraints**: Setting constraints for position distribution, total playing time (limit of 250 minutes for all players), and team composition.
-3. **Team Optimization**: Analyzing the data and selecting the best players to maximize the team’s overall performance while ensuring that each player has sufficient playing time.
-4. **Results**: Displaying the selected players with a table and a chart that shows their statistics.
+    # Creating dictionaries for position constraints
+    pos_constraints = {
+        'F': fwd_count,
+        'G': g_count,
+        'C': c_count
+    }
 
-This tool offers a mathematical approach for **effective team composition**, ensuring that all players have adequate playing time, and the total playing time does not exceed 250 minutes. It is ideal for coaches, analysts, and sports professionals who want to make more strategic and data-driven player selections.
-""")
+    # Creating dictionaries for the statistics to be optimized by position
+    pos_stats = {
+        'F': fwd_stats,
+        'G': g_stats,
+        'C': c_stats
+    }
 
-# Filters for positions above the table
-st.markdown("Select Players by Position and Optimization Statistic")
-fwd_count = st.slider("How many Forwards (F) do you want?", min_value=0, max_value=5, value=4)
-g_count = st.slider("How many Guards (G) do you want?", min_value=0, max_value=5, value=5)
-c_count = st.slider("How many Centers (C) do you want?", min_value=0, max_value=5, value=3)
-
-# Select the statistics to be optimized for each position
-fwd_stats = st.multiselect("Statistics to Optimize (Forwards)", 
-                           ['Points_per_36_minutes', 'Assists_per_36_minutes', 'Rebounds_per_36_minutes'], 
-                           default=['Points_per_36_minutes'])
-g_stats = st.multiselect("Statistics to Optimize (Guards)", 
-                         ['Points_per_36_minutes', 'Assists_per_36_minutes', 'Rebounds_per_36_minutes'], 
-                         default=['Points_per_36_minutes'])
-c_stats = st.multiselect("Statistics to Optimize (Centers)", 
-                         ['Points_per_36_minutes', 'Assists_per_36_minutes', 'Rebounds_per_36_minutes'], 
-                         default=['Points_per_36_minutes'])
-
-# Creating dictionaries for position constraints
-pos_constraints = {
-    'F': fwd_count,
-    'G': g_count,
-    'C': c_count
-}
-
-# Creating dictionaries for the statistics to be optimized by position
-pos_stats = {
-    'F': fwd_stats,
-    'G': g_stats,
-    'C': c_stats
-}
-
-# Filtering NaN/inf values in relevant fields
-filtered_data_clean = filtered_data[
-    filtered_data['Points_per_36_minutes'].notna() & 
-    filtered_data['Points_per_36_minutes'].apply(np.isfinite) & 
-    filtered_data['Minutes_per_Game'].notna() & 
-    filtered_data['Minutes_per_Game'].apply(np.isfinite)
-]
-
-# Filter for mandatory players to be included in the roster
-mandatory_players = st.multiselect(
-    "Select players who must be included in the roster:",
-    options=filtered_data_clean["Player"].unique(),
-    default=[],
-    help="The selected players will be included in the roster."
-)
+    # Filter for mandatory players to be included in the roster
+    mandatory_players = player_picker(
+        "Select players who must be included in the roster:",
+        "mandatory_players",
+        player_search_index,
+        candidates=filtered_data["Player"].unique(),
+        help="The selected players will be included in the roster."
+    )
 
-# Filter for players to be excluded from the roster
-excluded_players = st.multiselect(
-    "Select players who will not be included in the roster:",
-    options=[player for player in filtered_data_clean["Player"].unique() if player not in mandatory_players],
-    default=[],
-    help="The selected players will be excluded from the roster."
-)
+    # Filter for players to be excluded from the roster
+    excluded_players = player_picker(
+        "Select players who will not be included in the roster:",
+        "excluded_players",
+        player_search_index,
+        candidates=[player for player in filtered_data["Player"].unique() if player not in mandatory_players],
+        help="The selected players will be excluded from the roster."
+    )
 
-# Create the optimization problem
-prob = pulp.LpProblem("Optimized_Team_Selection", pulp.LpMaximize)
-
-# Create variables for player selection
-players = filtered_data_clean["Player"].unique().tolist()
-player_vars = pulp.LpVariable.dicts("Player", players, cat='Binary')
-
-# Objective function: Maximize selected statistic per position
-prob += pulp.lpSum([
-    filtered_data_clean.loc[filtered_data_clean["Player"] == player, stat].values[0] * player_vars[player]
-    for player in players for stat in pos_stats[filtered_data_clean.loc[filtered_data_clean["Player"] == player, 'Position'].values[0]]
-])
-
-# Constraint for total playing time (min/gp ≤ 250)
-prob += pulp.lpSum([
-    filtered_data_clean.loc[filtered_data_clean["Player"] == player, 'Minutes_per_Game'].values[0] * player_vars[player]
-    for player in players
-]) <= 250
-
-# Constraint to select exactly 12 players
-prob += pulp.lpSum([player_vars[player] for player in players]) == 12
-
-# Position constraints
-for pos, count in pos_constraints.items():
-    prob += pulp.lpSum([
-        player_vars[player]
-        for player in players if filtered_data_clean.loc[filtered_data_clean["Player"] == player, 'Position'].values[0] == pos
-    ]) == count
-
-# Constraints for mandatory players in the roster
-for player in mandatory_players:
-    prob += player_vars[player] == 1
-
-# Constraints for excluded players from the roster
-for player in excluded_players:
-    prob += player_vars[player] == 0
-
-# Solve the problem
-prob.solve()
-
-# Retrieve selected players
-selected_players = [player for player in players if player_vars[player].varValue == 1]
-
-# Display the selected players
-df_selected = filtered_data_clean[filtered_data_clean["Player"].isin(selected_players)]
-
-# Show the selected players' data in a table
-with st.expander("Selected Players for the Team"):
-    st.write(df_selected)
-
-# Create a bar chart with the selected players' statistics
-fig = px.bar(
-    df_selected,
-    x="Points_per_36_minutes",  # You can change this to any statistic you like (e.g., 'Rebounds_per_36_minutes')
-    y="Player",  # Player on the y-axis
-    title="Selected Players and Their Statistics",
-    labels={"Player": "Player", "Points_per_36_minutes": "Points per 36 Minutes"},
-    color="Position",  # Color by position
-    color_continuous_scale="Viridis",
-    orientation="h"  # Defines the chart with horizontal bars
-)
+    # Solve the optimization problem and retrieve the selected players
+    df_selected, roster_status = analytics.optimize_roster(
+        filtered_data,
+        pos_constraints,
+        pos_stats,
+        mandatory_players=mandatory_players,
+        excluded_players=excluded_players
+    )
+    if roster_status != "Optimal":
+        st.warning(f"No optimal roster for these constraints (solver status: {roster_status}).")
+    else:
+        # Show the selected players' data in a table
+        with st.expander("Selected Players for the Team"):
+            st.write(df_selected)
+
+        # Create a bar chart with the selected players' statistics
+        fig = px.bar(
+            df_selected,
+            x="Points_per_36_minutes",  # You can change this to any statistic you like (e.g., 'Rebounds_per_36_minutes')
+            y="Player",  # Player on the y-axis
+            title="Selected Players and Their Statistics",
+            labels={"Player": "Player", "Points_per_36_minutes": "Points per 36 Minutes"},
+            color="Position",  # Color by position
+            color_continuous_scale="Viridis",
+            orientation="h"  # Defines the chart with horizontal bars
+        )
 
-# Update chart with larger size
-fig.update_layout(
-    height=500,  # Increase height of the chart
-    width=800,  # Increase width of the chart
-)
+        # Update chart with larger size
+        fig.update_layout(
+            height=500,  # Increase height of the chart
+            width=800,  # Increase width of the chart
+        )
 
-# Display the chart
-st.plotly_chart(fig)
+        # Display the chart
+        st.plotly_chart(fig)
 
 
 
+if "Similar Players" in visible_sections:
+    st.markdown("""
+        <hr style="height:2px; border:none; color:#1E90FF; background-color:#1E90FF;">
+    """, unsafe_allow_html=True)
 
 
 
 
-st.markdown("""
-    <hr style="height:2px; border:none; color:#1E90FF; background-color:#1E90FF;">
-""", unsafe_allow_html=True)
+    # New list of statistics for selection
+    all_stats_columns = analytics.PER_36_STATS
 
+    # Streamlit app structure
+    st.subheader("Prediction of Similar Players Based on Statistics")
+    st.markdown("""
+    Discover the most similar players based on their statistics.
+    We use advanced machine learning algorithms 
+    to find the most accurate matches in real-time. 
+    """)
 
-
-import streamlit as st
-import pandas as pd
-import plotly.express as px
-from sklearn.preprocessing import StandardScaler
-from sklearn.neighbors import NearestNeighbors
-
-# New list of statistics for selection
-all_stats_columns = [
-    "Points_per_36_minutes", 
-    "Assists_per_36_minutes", 
-    "Rebounds_per_36_minutes"
-]
-
-# Streamlit app structure
-st.subheader("Prediction of Similar Players Based on Statistics")
-st.markdown("""
-Discover the most similar players based on their statistics.
-We use advanced machine learning algorithms 
-to find the most accurate matches in real-time. 
-""")
-
-# Selecting statistics by the user
-selected_stats = st.multiselect("Select Statistics:", all_stats_columns, default=["Points_per_36_minutes", "Rebounds_per_36_minutes", "Assists_per_36_minutes"])
-
-# Checking if any statistics were selected
-if not selected_stats:
-    st.warning("Please select at least one statistic to proceed.")
-else:
-    # Normalizing the data for the selected statistics
-    scaler = StandardScaler()
-    data_normalized = scaler.fit_transform(filtered_data[selected_stats])
-
-    # Creating a k-NN model
-    model = NearestNeighbors(n_neighbors=6, metric='euclidean')  # More neighbors to ensure the selected player is excluded
-    model.fit(data_normalized)
+    # Selecting statistics by the user
+    selected_stats = st.multiselect("Select Statistics:", all_stats_columns, default=["Points_per_36_minutes", "Rebounds_per_36_minutes", "Assists_per_36_minutes"])
 
     # Selecting a player from the user
-    player_name = st.selectbox("Select Player:", filtered_data["Player"])
-
-    # Finding the corresponding player in the data
-    player_index = filtered_data[filtered_data["Player"] == player_name].index[0]
-
-    # Finding the most similar players
-    distances, indices = model.kneighbors([data_normalized[player_index]])
-
-    # Collecting the data for the chart and excluding the selected player from the results
-    similar_players = []
-    for idx in indices[0]:
-        if filtered_data.iloc[idx]["Player"] != player_name:  # Excluding the selected player
-            similar_player = filtered_data.iloc[idx]
-            similar_players.append((similar_player['Player'], distances[0][indices[0] == idx][0]))
-
-    # Creating the interactive chart with Plotly
-    player_names = [player[0] for player in similar_players]
-    distances_values = [player[1] for player in similar_players]
-
-    # Creating the interactive chart with Plotly
-    fig = px.bar(
-        x=distances_values,
-        y=player_names,
-        orientation='h',
-        labels={'x': 'Statistical Distance', 'y': 'Players'},
-        title='Most Similar Players Based on Selected Statistics',
-        color=distances_values,
-        color_continuous_scale='Viridis'
+    player_name = player_picker("Select Player:", "similar_player", player_search_index, candidates=filtered_data["Player"], multiple=False)
+
+    # Checking if any statistics were selected
+    if not selected_stats:
+        st.warning("Please select at least one statistic to proceed.")
+    elif player_name is not None:
+        # Finding the most similar players (k-NN on the normalized statistics), excluding the selected player
+        similar_players = analytics.similar_players(filtered_data, player_name, selected_stats)
+        if not similar_players:
+            st.write("There are no other players that meet the filtering criteria.")
+        else:
+            # Creating the interactive chart with Plotly
+            player_names = [player[0] for player in similar_players]
+            distances_values = [player[1] for player in similar_players]
+
+            # Creating the interactive chart with Plotly
+            fig = px.bar(
+                x=distances_values,
+                y=player_names,
+                orientation='h',
+                labels={'x': 'Statistical Distance', 'y': 'Players'},
+                title='Most Similar Players Based on Selected Statistics',
+                color=distances_values,
+                color_continuous_scale='Viridis'
+            )
+
+            # Adjusting the size of the chart
+            fig.update_layout(
+                width=600,  # Width size
+                height=400,  # Height size
+            )
+
+            # Displaying the interactive chart
+            st.plotly_chart(fig)
+
+
+
+if "Player Archetypes" in visible_sections:
+    st.markdown("""
+        <hr style="height:2px; border:none; color:#1E90FF; background-color:#1E90FF;">
+    """, unsafe_allow_html=True)
+
+    st.subheader("Player Archetypes")
+    st.markdown("""
+    Player roles (e.g. **Stretch Forward**, **Rim-Running Center**, **Scoring Guard**) are discovered with **k-means clustering** 
+    over the full statistical profile of each player: per-36 production (points, assists, offensive and defensive rebounds, steals, blocks, turnovers), 
+    shot profile (three-point and free-throw rate, true shooting) and minutes per game. 
+    Each archetype is named after its most common position and the statistic in which it stands out compared to the other players of that position.
+    The archetypes can be used as a filter in the sidebar and are shown in the Radar Chart and the Team Needs Index.
+    """)
+
+    # Scatter chart of the players colored by archetype
+    fig_archetypes = px.scatter(
+        filtered_data,
+        x="Points_per_36_minutes",
+        y="Rebounds_per_36_minutes",
+        color="Archetype",
+        hover_name="Player",
+        hover_data=["Team", "Position", "Assists_per_36_minutes"],
+        title="Players by Archetype",
+        template="plotly_white"
     )
-
-    # Adjusting the size of the chart
-    fig.update_layout(
-        width=600,  # Width size
-        height=400,  # Height size
+    fig_archetypes.update_layout(
+        height=600,
+        width=900
     )
+    st.plotly_chart(fig_archetypes)
 
-    # Displaying the interactive chart
-    st.plotly_chart(fig)
-
+    # Average profile of each archetype
+    with st.expander("Archetype profiles (average statistics per archetype)"):
+        st.dataframe(archetype_model.profiles)
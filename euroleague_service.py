@@ -0,0 +1,436 @@
+"""Local HTTP/JSON query service on top of euroleague_analytics.
+
+The datasets and their player search indexes are loaded once at startup and
+kept in memory. Requests are answered by a fixed pool of worker threads and
+responses are cached by query and dataset version, so repeated queries are
+served without touching the data again until the data is updated.
+
+Endpoints (GET with query-string parameters, or POST with a JSON body):
+
+    /health        service status and loaded datasets
+    /search        q, page, page_size: player search (prefix + fuzzy)
+    /players       filtered player records (optionally q, page, page_size)
+    /vtm           top-K players by Value-to-Minutes (k, default 30)
+    /underrated    underrated players screen
+    /team-needs    per-team deviation from the average
+    /optimize      optimized roster (forwards, guards, centers, *_stats, mandatory, excluded)
+    /similar       players similar to `player` (stats, n)
+    /archetypes    archetype profiles and the archetype of each filtered player
+    /archetypes/assign
+                   archetypes of new or updated players (POST `rows` of raw
+                   statistics), using the fitted centroids without refitting
+    /archetypes/update
+                   add or replace players in the dataset (POST only, `rows` of raw
+                   statistics); only those players are assigned an archetype
+
+All endpoints except /health, /search and /archetypes/* accept the player
+filters: dataset, teams, positions, players, archetypes, pts_min, reb_min,
+ast_min, min_minutes, max_minutes.
+List parameters are given as repeated keys in query strings
+(?teams=EA7&teams=OLY) and as JSON lists in POST bodies; values are never
+split on commas, since player names contain them ("N. Mirotic, EA7").
+Player names that are not in the dataset are rejected.
+
+Usage:
+    python euroleague_service.py --port 8000 --workers 8
+"""
+import argparse
+import json
+import threading
+import traceback
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import pandas as pd
+
+import euroleague_analytics as analytics
+import player_archetypes
+from player_search import PlayerSearchIndex
+
+DATASETS = {
+    "euroleague": "euroleague_stats.xlsx",
+    "eurocup": "eurocup_stats.xlsx",
+}
+
+LIST_PARAMS = {"teams", "positions", "players", "archetypes", "stats", "forward_stats", "guard_stats", "center_stats", "mandatory", "excluded"}
+FLOAT_PARAMS = {"pts_min", "reb_min", "ast_min", "min_minutes", "max_minutes"}
+INT_PARAMS = {"k", "n", "page", "page_size", "forwards", "guards", "centers"}
+POSITIVE_PARAMS = {"k", "n", "page", "page_size"}
+JSON_PARAMS = {"rows"}
+
+# Endpoints whose responses are never cached
+UNCACHED_ROUTES = {"/health", "/archetypes/update"}
+
+# Endpoints that change the data: POST only, so links and retried GETs cannot reach them
+POST_ONLY_ROUTES = {"/archetypes/update"}
+
+
+class UnknownEndpoint(Exception):
+    """Raised for request paths that are not served (HTTP 404)."""
+
+
+class MethodNotAllowed(Exception):
+    """Raised for GET requests to a POST-only endpoint (HTTP 405)."""
+
+
+def parse_params(params):
+    """Convert raw query parameters to typed values.
+
+    Query-string values arrive as strings ("10.5", or a list of strings for
+    list parameters, see ``query_params``); JSON bodies may already carry
+    lists and numbers. A single string for a list parameter is one item.
+    Raises ValueError or TypeError on malformed values.
+    """
+    parsed = {}
+    for name, value in params.items():
+        if name in LIST_PARAMS:
+            parsed[name] = [value] if isinstance(value, str) else list(value)
+        elif name in JSON_PARAMS:
+            parsed[name] = json.loads(value) if isinstance(value, str) else value
+        elif name in FLOAT_PARAMS:
+            parsed[name] = float(value)
+        elif name in INT_PARAMS:
+            parsed[name] = int(value)
+            if name in POSITIVE_PARAMS and parsed[name] < 1:
+                raise ValueError(f"{name} must be at least 1")
+        else:
+            parsed[name] = str(value)
+    return parsed
+
+
+def query_params(query):
+    """Parse a query string: list parameters collect every value of a repeated
+    key, the other parameters take the last one."""
+    return {name: values if name in LIST_PARAMS else values[-1] for name, values in parse_qs(query).items()}
+
+
+def records(frame):
+    """Serialize a DataFrame into a list of JSON-ready dicts (NaN/inf -> null)."""
+    return json.loads(frame.to_json(orient="records"))
+
+
+class QueryService:
+    """In-memory datasets, search indexes and response cache."""
+
+    def __init__(self, datasets=DATASETS, cache_size=1024, n_archetypes=player_archetypes.DEFAULT_ARCHETYPES):
+        validated = {name: analytics.load_data(path) for name, path in datasets.items()}
+        self.quarantined = {name: len(result.quarantined) for name, result in validated.items()}
+        self.archetype_models = {name: player_archetypes.fit_archetypes(result.data, n_archetypes) for name, result in validated.items()}
+        self.data = {name: analytics.add_archetypes(result.data, self.archetype_models[name].labels) for name, result in validated.items()}
+        self.indexes = {name: PlayerSearchIndex(data["Player"]) for name, data in self.data.items()}
+        self.versions = {name: model.version for name, model in self.archetype_models.items()}
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self._update_lock = threading.Lock()
+
+        self.routes = {
+            "/health": self.health,
+            "/search": self.search,
+            "/players": self.players,
+            "/vtm": self.vtm,
+            "/underrated": self.underrated,
+            "/team-needs": self.team_needs,
+            "/optimize": self.optimize,
+            "/similar": self.similar,
+            "/archetypes": self.archetypes,
+            "/archetypes/assign": self.assign_archetypes,
+            "/archetypes/update": self.update_archetypes,
+        }
+
+    def handle(self, path, params, method="GET"):
+        """Return the JSON response body (bytes) for a query, from the cache if possible."""
+        if path not in self.routes:
+            raise UnknownEndpoint(f"Unknown endpoint: {path}")
+        if path in POST_ONLY_ROUTES and method != "POST":
+            raise MethodNotAllowed(f"{path} only accepts POST requests")
+        params = parse_params(params)
+        if path in UNCACHED_ROUTES:
+            return json.dumps(self.routes[path](params)).encode()
+
+        # Updated datasets get a new version, so stale responses are never hit again
+        key = (path, json.dumps(self.versions, sort_keys=True), json.dumps(params, sort_keys=True))
+        with self._cache_lock:
+            body = self._cache.get(key)
+            if body is not None:
+                self._cache.move_to_end(key)
+                self.cache_hits += 1
+                return body
+            self.cache_misses += 1
+
+        body = json.dumps(self.routes[path](params)).encode()
+
+        with self._cache_lock:
+            self._cache[key] = body
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return body
+
+    def dataset(self, params):
+        name = params.get("dataset", "euroleague")
+        if name not in self.data:
+            raise ValueError(f"Unknown dataset: {name} (choose from {', '.join(self.data)})")
+        return name, self.data[name]
+
+    @staticmethod
+    def check_players(data, players, message="Unknown players"):
+        """Raise ValueError if any of the player names is not in the data."""
+        known = set(data["Player"])
+        unknown = [player for player in players if player not in known]
+        if unknown:
+            raise ValueError(f"{message}: {'; '.join(unknown)}")
+
+    def filtered(self, params):
+        """Apply the player filters of the request to its dataset."""
+        _, data = self.dataset(params)
+        self.check_players(data, params.get("players", []))
+        minutes_range = None
+        if "min_minutes" in params or "max_minutes" in params:
+            minutes_range = (params.get("min_minutes", float("-inf")), params.get("max_minutes", float("inf")))
+        return analytics.filter_players(
+            data,
+            teams=params.get("teams"),
+            positions=params.get("positions"),
+            players=params.get("players"),
+            pts_min=params.get("pts_min"),
+            reb_min=params.get("reb_min"),
+            ast_min=params.get("ast_min"),
+            minutes_range=minutes_range,
+            archetypes=params.get("archetypes"),
+        )
+
+    def health(self, params):
+        with self._cache_lock:
+            cache = {"entries": len(self._cache), "hits": self.cache_hits, "misses": self.cache_misses}
+        return {
+            "status": "ok",
+            "datasets": {name: len(data) for name, data in self.data.items()},
+            "versions": dict(self.versions),
+            "quarantined": self.quarantined,
+            "cache": cache,
+        }
+
+    def search(self, params):
+        name, _ = self.dataset(params)
+        result = self.indexes[name].search(params.get("q", ""), page=params.get("page", 1), page_size=params.get("page_size", 20))
+        return {"players": result.players, "page": result.page, "pages": result.pages, "total": result.total}
+
+    def players(self, params):
+        name, _ = self.dataset(params)
+        filtered_data = self.filtered(params)
+        if "q" not in params and "page_size" not in params:
+            return {"players": records(filtered_data), "total": len(filtered_data)}
+
+        result = self.indexes[name].search(
+            params.get("q", ""),
+            page=params.get("page", 1),
+            page_size=params.get("page_size", 20),
+            restrict_to=filtered_data["Player"],
+        )
+        page_data = filtered_data.set_index("Player", drop=False).loc[result.players]
+        return {"players": records(page_data), "page": result.page, "pages": result.pages, "total": result.total}
+
+    def vtm(self, params):
+        return {"players": records(analytics.top_vtm(self.filtered(params), k=params.get("k", 30)))}
+
+    def underrated(self, params):
+        underrated_players = analytics.underrated_players(self.filtered(params))
+        return {"players": records(underrated_players[["Player", "Team", "Position", "Points_per_36_minutes", "True_Shooting_Percentage", "Assist_to_Turnover_Ratio"]])}
+
+    def team_needs(self, params):
+        return {"teams": records(analytics.team_needs(self.filtered(params)).reset_index())}
+
+    def optimize(self, params):
+        _, data = self.dataset(params)
+        filtered_data = self.filtered(params)
+        mandatory_players = params.get("mandatory", [])
+        excluded_players = params.get("excluded", [])
+        self.check_players(data, mandatory_players + excluded_players)
+        self.check_players(filtered_data, mandatory_players, "Mandatory players not in the filtered data")
+        default_stats = ["Points_per_36_minutes"]
+        pos_constraints = {"F": params.get("forwards", 4), "G": params.get("guards", 5), "C": params.get("centers", 3)}
+        pos_stats = {
+            "F": params.get("forward_stats", default_stats),
+            "G": params.get("guard_stats", default_stats),
+            "C": params.get("center_stats", default_stats),
+        }
+        for stats in pos_stats.values():
+            unknown = set(stats) - set(analytics.PER_36_STATS)
+            if unknown:
+                raise ValueError(f"Unknown statistics: {', '.join(sorted(unknown))}")
+
+        df_selected, status = analytics.optimize_roster(
+            filtered_data,
+            pos_constraints,
+            pos_stats,
+            mandatory_players=mandatory_players,
+            excluded_players=excluded_players,
+        )
+        return {"status": status, "players": records(df_selected)}
+
+    def similar(self, params):
+        filtered_data = self.filtered(params)
+        player = params.get("player")
+        if player is None:
+            raise ValueError("Missing parameter: player")
+        if not (filtered_data["Player"] == player).any():
+            raise ValueError(f"Player not found in the filtered data: {player}")
+
+        stats = params.get("stats", analytics.PER_36_STATS)
+        unknown = set(stats) - set(analytics.PER_36_STATS)
+        if not stats or unknown:
+            raise ValueError(f"Statistics must be chosen from: {', '.join(analytics.PER_36_STATS)}")
+
+        matches = analytics.similar_players(filtered_data, player, stats, n_neighbors=params.get("n", 5))
+        return {"player": player, "similar": [{"player": name, "distance": distance} for name, distance in matches]}
+
+    def archetypes(self, params):
+        name, _ = self.dataset(params)
+        model = self.archetype_models[name]
+        filtered_data = self.filtered(params)
+        return {
+            "version": model.version,
+            "archetypes": records(model.profiles.reset_index()),
+            "players": records(filtered_data[["Player", "Team", "Position", "Archetype"]]),
+            "team_gaps": records(analytics.team_archetype_gaps(filtered_data, model.names).reset_index()),
+        }
+
+    def validated_rows(self, params):
+        rows = params.get("rows")
+        if not isinstance(rows, list) or not rows:
+            raise ValueError("Missing parameter: rows (list of player statistics)")
+        return analytics.validate_data(pd.DataFrame(rows))
+
+    def assign_archetypes(self, params):
+        name, _ = self.dataset(params)
+        validated = self.validated_rows(params)
+        assigned = self.archetype_models[name].assign(validated.data) if len(validated.data) else {}
+        return {
+            "version": self.archetype_models[name].version,
+            "archetypes": dict(assigned),
+            "rejected": records(validated.quarantined[["Player", "Quarantine_reason"]]),
+        }
+
+    def update_archetypes(self, params):
+        name, _ = self.dataset(params)
+        validated = self.validated_rows(params)
+        model = self.archetype_models[name]
+        with self._update_lock:
+            data = self.data[name].drop(columns="Archetype")
+            # Keys the dataset does not have (e.g. a stale Archetype) must not become new columns
+            rows = validated.data.reindex(columns=data.columns)
+            data = pd.concat([data[~data["Player"].isin(rows["Player"])], rows], ignore_index=True)
+            assigned = model.update(data)
+            self.data[name] = analytics.add_archetypes(data, model.labels)
+            self.indexes[name] = PlayerSearchIndex(data["Player"])
+            # Publish the new version only once the data it keys is in place
+            self.versions = {**self.versions, name: model.version}
+        return {
+            "version": model.version,
+            "archetypes": dict(assigned),
+            "players": len(data),
+            "rejected": records(validated.quarantined[["Player", "Quarantine_reason"]]),
+        }
+
+
+class QueryRequestHandler(BaseHTTPRequestHandler):
+    service = None
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        self.respond(url.path, query_params(url.query), "GET")
+
+    def do_POST(self):
+        url = urlsplit(self.path)
+        length = int(self.headers.get("Content-Length", 0))
+        try:
+            params = json.loads(self.rfile.read(length) or b"{}")
+            if not isinstance(params, dict):
+                raise ValueError("Request body must be a JSON object")
+        except ValueError as e:
+            self.send_json(400, json.dumps({"error": f"Invalid JSON body: {e}"}).encode())
+            return
+        self.respond(url.path, params, "POST")
+
+    def respond(self, path, params, method):
+        try:
+            body = self.service.handle(path.rstrip("/") or "/", params, method)
+        except UnknownEndpoint as e:
+            self.send_json(404, json.dumps({"error": str(e)}).encode())
+        except MethodNotAllowed as e:
+            self.send_json(405, json.dumps({"error": str(e)}).encode(), {"Allow": "POST"})
+        except (ValueError, TypeError) as e:
+            self.send_json(400, json.dumps({"error": str(e)}).encode())
+        except Exception as e:
+            traceback.print_exc()
+            self.send_json(500, json.dumps({"error": f"Internal error: {type(e).__name__}"}).encode())
+        else:
+            self.send_json(200, body)
+
+    def send_json(self, status, body, headers=None):
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # Keep the console quiet under load; errors are still reported to the client
+        pass
+
+
+class WorkerPoolHTTPServer(HTTPServer):
+    """HTTPServer that hands each connection to a fixed pool of worker threads."""
+
+    def __init__(self, server_address, handler_class, workers=8):
+        super().__init__(server_address, handler_class)
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="query-worker")
+
+    def process_request(self, request, client_address):
+        self.executor.submit(self._process_request_worker, request, client_address)
+
+    def _process_request_worker(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    def server_close(self):
+        super().server_close()
+        self.executor.shutdown(wait=True)
+
+
+def make_server(host="127.0.0.1", port=8000, workers=8, cache_size=1024, service=None):
+    """Create the server; the service (datasets + indexes) is built if not given."""
+    handler_class = type("BoundQueryRequestHandler", (QueryRequestHandler,), {"service": service or QueryService(cache_size=cache_size)})
+    return WorkerPoolHTTPServer((host, port), handler_class, workers=workers)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=8, help="Number of worker threads answering requests")
+    parser.add_argument("--cache-size", type=int, default=1024, help="Maximum number of cached responses")
+    args = parser.parse_args()
+
+    server = make_server(args.host, args.port, args.workers, args.cache_size)
+    print(f"Serving on http://{args.host}:{args.port} with {args.workers} workers")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""Load test for euroleague_service.py.
+
+Sends a mix of queries to a running service instance from several client
+threads and reports throughput and latency percentiles. Part of the queries
+are repeated, so both cached and uncached responses are measured.
+
+Usage:
+    python euroleague_service.py --port 8000 &
+    python load_test.py --url http://127.0.0.1:8000 --requests 2000 --concurrency 16
+"""
+import argparse
+import json
+import random
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from urllib.error import HTTPError
+from urllib.parse import urlencode
+from urllib.request import Request, urlopen
+
+
+def make_queries(rng, count, distinct):
+    """Return `count` (endpoint, params) queries drawn from `distinct` variants."""
+    variants = []
+    for i in range(distinct):
+        filters = {"pts_min": round(rng.uniform(0, 15), 1), "dataset": rng.choice(["euroleague", "eurocup"])}
+        variants += [
+            ("/players", filters),
+            ("/vtm", dict(filters, k=30)),
+            ("/underrated", filters),
+            ("/team-needs", filters),
+            ("/archetypes", filters),
+            ("/search", {"q": rng.choice(["mir", "ea7", "vezenkov", "campazo", "g", "oly"]), "page": 1}),
+        ]
+        if i % 5 == 0:
+            variants.append(("/optimize", {"dataset": filters["dataset"]}))
+            variants.append(("/similar", {"dataset": "euroleague", "player": "N. Mirotic, EA7", "n": 5}))
+    return [rng.choice(variants) for _ in range(count)]
+
+
+def send(url, endpoint, params, method):
+    start = time.perf_counter()
+    if method == "POST":
+        request = Request(url + endpoint, data=json.dumps(params).encode(), headers={"Content-Type": "application/json"})
+    else:
+        request = Request(f"{url}{endpoint}?{urlencode(params, doseq=True)}")
+    try:
+        with urlopen(request, timeout=60) as response:
+            response.read()
+            status = response.status
+    except HTTPError as e:
+        status = e.code
+    return endpoint, status, time.perf_counter() - start
+
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(q / 100 * (len(values) - 1))))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--requests", type=int, default=1000, help="Total number of requests")
+    parser.add_argument("--concurrency", type=int, default=8, help="Number of client threads")
+    parser.add_argument("--distinct", type=int, default=20, help="Number of distinct filter variants (lower = more cache hits)")
+    parser.add_argument("--method", choices=["GET", "POST"], default="GET")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    queries = make_queries(random.Random(args.seed), args.requests, args.distinct)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        results = list(executor.map(lambda q: send(args.url, q[0], q[1], args.method), queries))
+    elapsed = time.perf_counter() - start
+
+    latencies = [latency for _, _, latency in results]
+    errors = sum(1 for _, status, _ in results if status != 200)
+    by_endpoint = defaultdict(list)
+    for endpoint, _, latency in results:
+        by_endpoint[endpoint].append(latency)
+
+    print(f"Requests:    {len(results)} ({errors} errors) with {args.concurrency} clients")
+    print(f"Throughput:  {len(results) / elapsed:.1f} requests/s")
+    print(f"Latency:     p50 {percentile(latencies, 50) * 1000:.1f} ms, p95 {percentile(latencies, 95) * 1000:.1f} ms, max {max(latencies) * 1000:.1f} ms")
+    print(f"\n{'endpoint':<14} {'requests':>8} {'p50 [ms]':>9} {'p95 [ms]':>9}")
+    for endpoint, values in sorted(by_endpoint.items()):
+        print(f"{endpoint:<14} {len(values):>8} {percentile(values, 50) * 1000:>9.1f} {percentile(values, 95) * 1000:>9.1f}")
+
+    try:
+        with urlopen(f"{args.url}/health", timeout=10) as response:
+            print(f"\nService cache: {json.loads(response.read())['cache']}")
+    except OSError:
+        pass
+
+
+if __name__ == "__main__":
+    main()
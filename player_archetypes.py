@@ -0,0 +1,210 @@
+"""Player archetypes discovered by clustering the full stat vector.
+
+Players are clustered with mini-batch k-means over standardized per-36,
+shot-profile and role features. The fit runs once per dataset; the resulting
+``ArchetypeModel`` keeps the scaler, the centroids and the labels, and
+``ArchetypeModel.update`` brings the labels to a later version of the dataset
+by assigning only new or changed players to the nearest centroid, without
+refitting.
+
+Each cluster gets a readable name such as "Stretch Center" or "Scoring Guard"
+from its most common position and the feature in which it stands out most
+compared to the other players of that position.
+"""
+import hashlib
+import threading
+
+import numpy as np
+import pandas as pd
+
+# Features of the stat vector used for clustering: derived columns of the
+# validated data (see euroleague_analytics.add_derived_metrics)
+FEATURES = [
+    "Points_per_36_minutes", "Assists_per_36_minutes", "Offensive_rebounds_per_36_minutes",
+    "Defensive_rebounds_per_36_minutes", "Steals_per_36_minutes", "Blocks_per_36_minutes",
+    "Turnovers_per_36_minutes", "Three_point_attempt_rate", "Free_throw_attempt_rate",
+    "True_Shooting_Percentage", "Minutes_per_Game"
+]
+
+# Features that name an archetype when a cluster stands out in them
+TRAITS = {
+    "Points_per_36_minutes": "Scoring",
+    "Assists_per_36_minutes": "Playmaking",
+    "Three_point_attempt_rate": "Stretch",
+    "Offensive_rebounds_per_36_minutes": "Rim-Running",
+    "Blocks_per_36_minutes": "Rim-Protecting",
+    "Steals_per_36_minutes": "Defensive",
+}
+
+# Columns the clustering depends on
+SOURCE_COLUMNS = ["Player", "Position"] + FEATURES
+
+POSITION_NAMES = {"G": "Guard", "F": "Forward", "C": "Center"}
+
+# Traits that make sense for each position (all traits for other positions)
+POSITION_TRAITS = {
+    "G": ["Points_per_36_minutes", "Assists_per_36_minutes", "Three_point_attempt_rate", "Steals_per_36_minutes"],
+    "C": ["Points_per_36_minutes", "Assists_per_36_minutes", "Three_point_attempt_rate", "Offensive_rebounds_per_36_minutes", "Blocks_per_36_minutes"],
+}
+
+# Minimum deviation (in position standard deviations) for a trait to name a cluster
+MIN_TRAIT_SCORE = 0.25
+
+DEFAULT_ARCHETYPES = 8
+
+# Players below this many minutes have noisy per-36 rates: they do not shape the
+# centroids and are assigned to the nearest archetype after the fit
+MIN_FIT_MINUTES = 100
+
+
+def row_hashes(data):
+    """Hash of the clustering columns of each player, indexed by player."""
+    hashed = pd.util.hash_pandas_object(data[SOURCE_COLUMNS], index=False).to_numpy()
+    return pd.Series(hashed, index=data["Player"].to_numpy())
+
+
+def dataset_version(hashes):
+    """Content hash of a dataset, from its ``row_hashes``."""
+    return hashlib.sha1(hashes.to_numpy().tobytes()).hexdigest()[:12]
+
+
+class ArchetypeModel:
+    """Fitted archetype clustering, kept up to date with later dataset versions.
+
+    Attributes
+    ----------
+    version : str
+        ``dataset_version`` of the data the labels cover: the fitted data, or
+        the data of the last ``update``.
+    names : list of str
+        Archetype name of each cluster.
+    labels : Series
+        Archetype name per player, indexed by player.
+    profiles : DataFrame
+        Mean feature values, number of players and most common position per
+        archetype, for the players of the fit.
+    """
+
+    def __init__(self, scaler, kmeans, imputation, names, labels, profiles, hashes):
+        self.scaler = scaler
+        self.kmeans = kmeans
+        self.imputation = imputation
+        self.names = names
+        self.labels = labels
+        self.profiles = profiles
+        self.hashes = hashes
+        self.version = dataset_version(hashes)
+        self._lock = threading.Lock()
+
+    @property
+    def centroids(self):
+        """Cluster centers in the original feature units, one row per archetype."""
+        return pd.DataFrame(self.scaler.inverse_transform(self.kmeans.cluster_centers_), index=self.names, columns=FEATURES)
+
+    def _standardized(self, data):
+        return self.scaler.transform(data[FEATURES].fillna(self.imputation).to_numpy())
+
+    def assign(self, data):
+        """Return the archetype of each player in validated `data`, without refitting."""
+        clusters = self.kmeans.predict(self._standardized(data))
+        return pd.Series(np.asarray(self.names, dtype=object)[clusters], index=data["Player"].to_numpy(), name="Archetype")
+
+    def update(self, data):
+        """Bring the labels up to date with a new version of the validated data.
+
+        Only new players and players whose statistics changed are assigned to
+        the nearest centroid, without refitting; players missing from `data`
+        are dropped. Safe to call from several threads. Returns the archetypes
+        of the assigned players (empty if the version did not change).
+        """
+        hashes = row_hashes(data)
+        version = dataset_version(hashes)
+        with self._lock:
+            if version == self.version:
+                return pd.Series(dtype=object, name="Archetype")
+
+            # New players get hash 0, which keeps the uint64 dtype for the comparison
+            changed = (hashes != self.hashes.reindex(hashes.index, fill_value=0)).to_numpy()
+            assigned = self.assign(data[changed]) if changed.any() else pd.Series(dtype=object, name="Archetype")
+            labels = pd.concat([self.labels.drop(assigned.index, errors="ignore"), assigned])
+            self.labels = labels.reindex(hashes.index)
+            self.hashes = hashes
+            self.version = version
+        return assigned
+
+
+def name_clusters(data, features, clusters, n_clusters):
+    """Name each cluster after its most common position and strongest trait.
+
+    Traits are scored against the other players of the same position, in
+    standard deviations. Larger clusters pick first; a cluster whose best
+    name is taken falls back to its next trait.
+    """
+    positions = data["Position"].to_numpy()
+    position_mean = features.groupby(positions).mean()
+    position_std = features.groupby(positions).std(ddof=0).replace(0, np.nan)
+
+    cluster_mean = features.groupby(clusters).mean()
+    cluster_size = pd.Series(clusters).value_counts()
+    dominant = pd.Series(positions).groupby(clusters).agg(lambda p: p.value_counts().index[0])
+
+    names = [f"Archetype {cluster + 1}" for cluster in range(n_clusters)]
+    taken = set()
+    for cluster in cluster_size.index:
+        position = dominant[cluster]
+        noun = POSITION_NAMES.get(position, position)
+        traits = POSITION_TRAITS.get(position, list(TRAITS))
+        scores = ((cluster_mean.loc[cluster] - position_mean.loc[position]) / position_std.loc[position])[traits]
+        # Features without spread in the position (NaN score) cannot name a cluster
+        scores = scores.dropna()
+
+        candidates = []
+        for trait, score in scores.sort_values(ascending=False).items():
+            if score < MIN_TRAIT_SCORE:
+                break
+            adjective = "Shooting" if trait == "Three_point_attempt_rate" and position == "G" else TRAITS[trait]
+            candidates.append(f"{adjective} {noun}")
+        candidates.append(f"Role {noun}")
+
+        name = next((c for c in candidates if c not in taken), None)
+        if name is None:
+            number = 2
+            while f"{candidates[0]} {number}" in taken:
+                number += 1
+            name = f"{candidates[0]} {number}"
+        names[cluster] = name
+        taken.add(name)
+    return names
+
+
+def fit_archetypes(data, n_archetypes=DEFAULT_ARCHETYPES, random_state=0):
+    """Fit the archetype clustering on validated player data."""
+    from sklearn.cluster import MiniBatchKMeans
+    from sklearn.preprocessing import StandardScaler
+
+    # True shooting is undefined (NaN) for players without attempts
+    imputation = data[FEATURES].median()
+    features = data[FEATURES].fillna(imputation)
+
+    fit_rows = (data["Minutes_played"] >= MIN_FIT_MINUTES).to_numpy()
+    if fit_rows.sum() < n_archetypes:
+        fit_rows[:] = True
+
+    scaler = StandardScaler().fit(features[fit_rows].to_numpy())
+    standardized = scaler.transform(features.to_numpy())
+
+    n_clusters = max(1, min(n_archetypes, int(fit_rows.sum())))
+    kmeans = MiniBatchKMeans(n_clusters=n_clusters, batch_size=1024, n_init=3, random_state=random_state)
+    kmeans.fit(standardized[fit_rows])
+    clusters = kmeans.predict(standardized)
+
+    names = name_clusters(data, features, clusters, n_clusters)
+    named = np.asarray(names, dtype=object)[clusters]
+    labels = pd.Series(named, index=data["Player"].to_numpy(), name="Archetype")
+
+    profiles = features.groupby(named).mean()
+    profiles["Players"] = pd.Series(named).value_counts()
+    profiles["Position"] = pd.Series(data["Position"].to_numpy()).groupby(named).agg(lambda p: p.value_counts().index[0])
+    profiles.index.name = "Archetype"
+
+    return ArchetypeModel(scaler, kmeans, imputation, names, labels, profiles, row_hashes(data))
@@ -0,0 +1,164 @@
+"""Server-side search index over player names.
+
+Player names come in the "N. Mirotic, EA7" format: the player's name followed
+by the team code. The index splits each entry into name and team tokens and
+answers queries with prefix matching (sorted token list + binary search) and
+fuzzy matching (character trigram candidates scored by similarity), so only
+one page of results ever has to be sent to the browser.
+"""
+import bisect
+import math
+import unicodedata
+from collections import defaultdict
+from dataclasses import dataclass
+from difflib import SequenceMatcher
+
+# Minimum similarity for a fuzzy token match (0 to 1)
+FUZZY_CUTOFF = 0.6
+
+# Score of a prefix match relative to a fuzzy match of the same token
+PREFIX_SCORE = 2.0
+
+
+def normalize(text):
+    """Lowercase the text and strip accents, so "Dončić" matches "doncic"."""
+    decomposed = unicodedata.normalize("NFKD", str(text))
+    return "".join(c for c in decomposed if not unicodedata.combining(c)).lower().strip()
+
+
+def split_player(player):
+    """Split "N. Mirotic, EA7" into ("N. Mirotic", "EA7")."""
+    name, sep, team = str(player).rpartition(", ")
+    if not sep:
+        return str(player), ""
+    return name, team
+
+
+def tokenize(text):
+    """Split normalized text into search tokens ("n. mirotic" -> ["n", "mirotic"])."""
+    cleaned = "".join(c if c.isalnum() else " " for c in normalize(text))
+    return cleaned.split()
+
+
+def trigrams(token):
+    padded = f"  {token} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+@dataclass
+class SearchPage:
+    """One page of search results."""
+    players: list
+    page: int
+    pages: int
+    total: int
+
+
+class PlayerSearchIndex:
+    """Prefix and fuzzy search over a list of player names.
+
+    Parameters
+    ----------
+    players : iterable of str
+        Player entries in the "N. Mirotic, EA7" format. Duplicates are ignored
+        and the original order is kept for empty queries.
+    """
+
+    def __init__(self, players):
+        self.players = list(dict.fromkeys(players))
+        self.names = []
+        self.teams = []
+
+        token_players = defaultdict(set)
+        for player_id, player in enumerate(self.players):
+            name, team = split_player(player)
+            self.names.append(name)
+            self.teams.append(team)
+            for token in tokenize(name) + tokenize(team):
+                token_players[token].add(player_id)
+
+        # Sorted vocabulary for prefix lookups
+        self._tokens = sorted(token_players)
+        self._token_players = [token_players[token] for token in self._tokens]
+
+        # Trigram -> token positions, for fuzzy candidate generation
+        self._trigram_tokens = defaultdict(set)
+        for position, token in enumerate(self._tokens):
+            for gram in trigrams(token):
+                self._trigram_tokens[gram].add(position)
+
+    def __len__(self):
+        return len(self.players)
+
+    def _prefix_matches(self, query_token):
+        start = bisect.bisect_left(self._tokens, query_token)
+        end = bisect.bisect_left(self._tokens, query_token + "\uffff")
+        return range(start, end)
+
+    def _fuzzy_matches(self, query_token):
+        grams = trigrams(query_token)
+        counts = defaultdict(int)
+        for gram in grams:
+            for position in self._trigram_tokens.get(gram, ()):
+                counts[position] += 1
+
+        matches = {}
+        for position, shared in counts.items():
+            # Cheap trigram overlap filter before the exact similarity ratio
+            if 2 * shared / (len(grams) + len(trigrams(self._tokens[position]))) < FUZZY_CUTOFF / 2:
+                continue
+            ratio = SequenceMatcher(None, query_token, self._tokens[position]).ratio()
+            if ratio >= FUZZY_CUTOFF:
+                matches[position] = ratio
+        return matches
+
+    def _token_scores(self, query_token):
+        """Return {player_id: score} for the players matching one query token."""
+        scores = {}
+        for position, ratio in self._fuzzy_matches(query_token).items():
+            for player_id in self._token_players[position]:
+                scores[player_id] = max(scores.get(player_id, 0.0), ratio)
+        for position in self._prefix_matches(query_token):
+            exact = self._tokens[position] == query_token
+            for player_id in self._token_players[position]:
+                scores[player_id] = max(scores.get(player_id, 0.0), PREFIX_SCORE + exact)
+        return scores
+
+    def match(self, query, restrict_to=None):
+        """Return all players matching the query, best matches first.
+
+        Every query token has to match a name or team token, either as a
+        prefix or fuzzily. An empty query matches every player in index order.
+        ``restrict_to`` limits the results to the given player names.
+        """
+        allowed = None if restrict_to is None else set(restrict_to)
+        query_tokens = tokenize(query)
+
+        if not query_tokens:
+            return [p for p in self.players if allowed is None or p in allowed]
+
+        totals = None
+        for query_token in query_tokens:
+            scores = self._token_scores(query_token)
+            if totals is None:
+                totals = scores
+            else:
+                totals = {pid: totals[pid] + s for pid, s in scores.items() if pid in totals}
+            if not totals:
+                return []
+
+        ranked = sorted(totals, key=lambda pid: (-totals[pid], self.players[pid]))
+        return [self.players[pid] for pid in ranked if allowed is None or self.players[pid] in allowed]
+
+    def search(self, query, page=1, page_size=20, restrict_to=None):
+        """Return one page of results for the query as a ``SearchPage``.
+
+        Out-of-range pages are clamped; ``page_size`` must be at least 1.
+        """
+        if page_size < 1:
+            raise ValueError("page_size must be at least 1")
+        results = self.match(query, restrict_to=restrict_to)
+        pages = max(1, math.ceil(len(results) / page_size))
+        page = min(max(1, int(page)), pages)
+        start = (page - 1) * page_size
+        return SearchPage(results[start:start + page_size], page, pages, len(results))
@@ -0,0 +1,109 @@
+"""Startup profile and import-time budget check for euroleague_app.py.
+
+The "core path" is the set of module-level imports of the app, i.e. what
+every session pays for before the first section renders. Heavy dependencies
+(pulp, scikit-learn, statsmodels) must only be imported inside the section
+that needs them. Sections that are shown still import them on their first
+run; the budget covers the module-level imports only.
+
+tests/test_startup.py runs the same check under pytest (pip install -r
+requirements-dev.txt, then python -m pytest).
+
+Usage:
+    python profile_startup.py                  # print the import-time breakdown
+    python profile_startup.py --budget 2.5     # exit 1 if the core path exceeds 2.5 s
+"""
+import argparse
+import ast
+import os
+import subprocess
+import sys
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+APP_FILE = os.path.join(APP_DIR, "euroleague_app.py")
+
+# Modules that must never be loaded by the app's core path
+HEAVY_MODULES = ["pulp", "sklearn", "statsmodels", "scipy"]
+
+# Default budget for the core path, in seconds (cumulative import time)
+DEFAULT_BUDGET = 3.0
+
+
+def core_imports(app_file=APP_FILE):
+    """Return the import statements found at module level of the app."""
+    with open(app_file, encoding="utf-8") as f:
+        tree = ast.parse(f.read(), filename=app_file)
+    return [ast.unparse(node) for node in tree.body if isinstance(node, (ast.Import, ast.ImportFrom))]
+
+
+def profile_imports(statements):
+    """Run the import statements in a fresh interpreter with -X importtime.
+
+    Returns a list of (module, self_us, cumulative_us, depth) rows and the
+    list of heavy modules that ended up in sys.modules.
+    """
+    code = "\n".join(statements + [
+        "import sys",
+        f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))",
+    ])
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=APP_DIR,
+    )
+
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        rows.append((name.strip(), int(self_us), int(cumulative_us), depth))
+
+    loaded_heavy = [m for m in result.stdout.strip().split(",") if m]
+    return rows, loaded_heavy
+
+
+def total_import_time(rows):
+    """Total import time in seconds: the top-level rows (depth 0) add up to it."""
+    return sum(cumulative for _, _, cumulative, depth in rows if depth == 0) / 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--budget", type=float, default=DEFAULT_BUDGET, help="Import-time budget for the core path in seconds")
+    parser.add_argument("--top", type=int, default=15, help="Number of slowest modules to list")
+    args = parser.parse_args()
+
+    statements = core_imports()
+    rows, loaded_heavy = profile_imports(statements)
+
+    total_s = total_import_time(rows)
+
+    print("Core path imports:")
+    for statement in statements:
+        print(f"  {statement}")
+
+    print(f"\nTop {args.top} modules by cumulative import time:")
+    print(f"  {'cumulative [ms]':>15} {'self [ms]':>10}  module")
+    for name, self_us, cumulative_us, _ in sorted(rows, key=lambda r: r[2], reverse=True)[:args.top]:
+        print(f"  {cumulative_us / 1000:15.1f} {self_us / 1000:10.1f}  {name}")
+
+    print(f"\nTotal core path import time: {total_s:.3f} s (budget {args.budget:.3f} s)")
+
+    failed = False
+    if loaded_heavy:
+        print(f"FAIL: heavy modules loaded on the core path: {', '.join(loaded_heavy)}")
+        failed = True
+    if total_s > args.budget:
+        print("FAIL: core path import time is over budget")
+        failed = True
+    if not failed:
+        print("OK")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,50 @@
+import pandas as pd
+import pytest
+
+from euroleague_analytics import load_data, validate_data
+from player_archetypes import DEFAULT_ARCHETYPES, FEATURES, fit_archetypes, name_clusters
+
+
+@pytest.fixture(scope="module")
+def raw():
+    return pd.read_excel("euroleague_stats.xlsx")
+
+
+def test_fit_labels_every_player():
+    data = load_data("euroleague_stats.xlsx").data
+    model = fit_archetypes(data)
+
+    assert len(model.names) == DEFAULT_ARCHETYPES == len(set(model.names))
+    assert model.labels.index.tolist() == data["Player"].tolist()
+    assert set(model.labels) <= set(model.names)
+
+
+def test_update_assigns_only_new_and_changed_players(raw):
+    data = validate_data(raw).data
+    model = fit_archetypes(data)
+    version = model.version
+
+    assert model.update(data).empty
+    assert model.version == version
+
+    changed = raw.copy()
+    changed.loc[0, "Points"] += 50
+    new_player = raw.iloc[[1]].assign(Player="A. Newcomer, EA7")
+    # Player 0 changed, player 1 left and a new player joined
+    updated = validate_data(pd.concat([changed.drop(index=1), new_player], ignore_index=True)).data
+
+    assigned = model.update(updated)
+    assert sorted(assigned.index) == sorted([raw.loc[0, "Player"], "A. Newcomer, EA7"])
+    assert model.version != version
+    assert model.labels.index.tolist() == updated["Player"].tolist()
+    assert raw.loc[1, "Player"] not in model.labels
+
+
+def test_features_without_spread_do_not_name_clusters():
+    # The only center has no spread in any feature; the guards differ in scoring only
+    data = pd.DataFrame({"Position": ["G", "G", "G", "G", "C"]})
+    features = pd.DataFrame(1.0, index=data.index, columns=FEATURES)
+    features.loc[[0, 1], "Points_per_36_minutes"] = 20.0
+
+    names = name_clusters(data, features, [0, 0, 1, 1, 2], 3)
+    assert names == ["Scoring Guard", "Role Guard", "Role Center"]
@@ -0,0 +1,75 @@
+import pytest
+
+from player_search import PlayerSearchIndex, split_player, tokenize
+
+PLAYERS = [
+    "N. Mirotic, EA7",
+    "S. Vezenkov, OLY",
+    "L. Dončić, RMB",
+    "L. Mitrovic, CZV",
+    "A. Brooks, EA7",
+    "F. Campazzo, RMB",
+]
+
+
+def test_split_and_tokenize():
+    assert split_player("N. Mirotic, EA7") == ("N. Mirotic", "EA7")
+    assert split_player("Mirotic") == ("Mirotic", "")
+    assert tokenize("L. Dončić") == ["l", "doncic"]
+
+
+def test_prefix_match_on_name_and_team():
+    index = PlayerSearchIndex(PLAYERS)
+    assert index.match("vez") == ["S. Vezenkov, OLY"]
+    assert index.match("ea7") == ["A. Brooks, EA7", "N. Mirotic, EA7"]
+
+
+def test_exact_and_prefix_rank_before_fuzzy():
+    index = PlayerSearchIndex(PLAYERS)
+    assert index.match("mirotic")[0] == "N. Mirotic, EA7"
+
+
+def test_fuzzy_match_and_accents():
+    index = PlayerSearchIndex(PLAYERS)
+    assert index.match("mirotc") == ["N. Mirotic, EA7"]
+    assert index.match("campazo") == ["F. Campazzo, RMB"]
+    assert index.match("doncic") == ["L. Dončić, RMB"]
+
+
+def test_every_query_token_must_match():
+    index = PlayerSearchIndex(PLAYERS)
+    assert index.match("mirotic ea7") == ["N. Mirotic, EA7"]
+    assert index.match("mirotic oly") == []
+    assert index.match("zzz") == []
+
+
+def test_empty_query_keeps_index_order_and_drops_duplicates():
+    index = PlayerSearchIndex(PLAYERS + ["N. Mirotic, EA7"])
+    assert len(index) == len(PLAYERS)
+    assert index.match("") == PLAYERS
+
+
+def test_restrict_to():
+    index = PlayerSearchIndex(PLAYERS)
+    assert index.match("ea7", restrict_to=["N. Mirotic, EA7"]) == ["N. Mirotic, EA7"]
+    assert index.match("", restrict_to=[]) == []
+
+
+def test_pagination():
+    index = PlayerSearchIndex(PLAYERS)
+
+    first = index.search("", page=1, page_size=4)
+    assert (first.players, first.page, first.pages, first.total) == (PLAYERS[:4], 1, 2, 6)
+
+    last = index.search("", page=2, page_size=4)
+    assert last.players == PLAYERS[4:]
+
+    # Out-of-range pages are clamped
+    assert index.search("", page=9, page_size=4).page == 2
+    assert index.search("", page=0, page_size=4).page == 1
+
+    empty = index.search("zzz")
+    assert (empty.players, empty.page, empty.pages, empty.total) == ([], 1, 1, 0)
+
+    with pytest.raises(ValueError):
+        index.search("", page_size=0)
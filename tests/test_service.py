@@ -0,0 +1,112 @@
+import json
+import threading
+from urllib.error import HTTPError
+from urllib.parse import quote
+from urllib.request import urlopen
+
+import pytest
+
+from euroleague_service import MethodNotAllowed, QueryService, UnknownEndpoint, make_server, parse_params, query_params
+
+
+@pytest.fixture(scope="module")
+def service():
+    return QueryService(cache_size=16)
+
+
+def test_query_string_lists_use_repeated_keys():
+    params = parse_params(query_params("players=N.+Mirotic%2C+EA7&players=S.+Vezenkov%2C+OLY&k=5&k=10&pts_min=2.5"))
+    assert params == {"players": ["N. Mirotic, EA7", "S. Vezenkov, OLY"], "k": 10, "pts_min": 2.5}
+
+
+def test_json_lists_are_never_split():
+    params = parse_params({"mandatory": ["N. Mirotic, EA7"], "excluded": "S. Vezenkov, OLY", "teams": []})
+    assert params == {"mandatory": ["N. Mirotic, EA7"], "excluded": ["S. Vezenkov, OLY"], "teams": []}
+
+
+def test_json_rows_are_never_unwrapped():
+    row = {"Player": "N. Mirotic, EA7", "Points": 100}
+    assert parse_params({"rows": [row]}) == {"rows": [row]}
+    assert parse_params(query_params("rows=" + json.dumps([row]))) == {"rows": [row]}
+
+
+def test_malformed_values_raise():
+    with pytest.raises(ValueError):
+        parse_params({"k": "ten"})
+    with pytest.raises(TypeError):
+        parse_params({"teams": 5})
+
+
+def test_player_names_with_commas(service):
+    body = json.loads(service.handle("/players", {"players": ["N. Mirotic, EA7"]}))
+    assert [player["Player"] for player in body["players"]] == ["N. Mirotic, EA7"]
+
+
+@pytest.mark.parametrize("path, params", [
+    ("/players", {"players": ["N. Mirotic"]}),
+    ("/optimize", {"mandatory": ["Nobody, XXX"]}),
+    ("/optimize", {"excluded": ["Nobody, XXX"]}),
+    ("/optimize", {"teams": ["OLY"], "mandatory": ["N. Mirotic, EA7"]}),
+    ("/similar", {"player": "Nobody, XXX"}),
+])
+def test_unknown_players_are_rejected(service, path, params):
+    with pytest.raises(ValueError):
+        service.handle(path, params)
+
+
+@pytest.mark.parametrize("name", ["k", "n", "page", "page_size"])
+def test_counts_must_be_positive(name):
+    with pytest.raises(ValueError, match=name):
+        parse_params({name: "0"})
+
+
+def test_unknown_endpoint(service):
+    with pytest.raises(UnknownEndpoint):
+        service.handle("/nope", {})
+
+
+def test_infeasible_roster_is_empty(service):
+    body = json.loads(service.handle("/optimize", {"teams": ["EA7"], "forwards": 12, "guards": 0, "centers": 0}))
+    assert body["status"] != "Optimal"
+    assert body["players"] == []
+
+    body = json.loads(service.handle("/optimize", {}))
+    assert body["status"] == "Optimal"
+    assert len(body["players"]) == 12
+
+
+def test_update_adds_players_and_invalidates_the_cache():
+    service = QueryService(cache_size=16)
+    before = json.loads(service.handle("/players", {"teams": ["EA7"]}))
+
+    row = dict(before["players"][0], Player="A. Newcomer, EA7", Archetype="Stale", Extra_field=1)
+    body = json.loads(service.handle("/archetypes/update", {"rows": [row]}, "POST"))
+    assert list(body["archetypes"]) == ["A. Newcomer, EA7"]
+    assert body["rejected"] == []
+
+    after = json.loads(service.handle("/players", {"teams": ["EA7"]}))
+    assert after["total"] == before["total"] + 1
+    assert set(after["players"][0]) == set(before["players"][0])
+    assert next(p for p in after["players"] if p["Player"] == "A. Newcomer, EA7")["Archetype"] == body["archetypes"]["A. Newcomer, EA7"]
+    assert json.loads(service.handle("/search", {"q": "newcomer"}))["players"] == ["A. Newcomer, EA7"]
+    assert json.loads(service.handle("/health", {}))["versions"]["euroleague"] == body["version"]
+
+
+def test_update_is_post_only(service):
+    row = dict(json.loads(service.handle("/players", {"teams": ["EA7"]}))["players"][0], Player="Z. Ghost, EA7")
+    with pytest.raises(MethodNotAllowed):
+        service.handle("/archetypes/update", {"rows": [row]})
+
+    server = make_server(port=0, workers=1, service=service)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        url = f"http://127.0.0.1:{server.server_address[1]}/archetypes/update?rows={quote(json.dumps([row]))}"
+        with pytest.raises(HTTPError) as error:
+            urlopen(url, timeout=10)
+        assert error.value.code == 405
+        assert error.value.headers["Allow"] == "POST"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert "Z. Ghost, EA7" not in service.data["euroleague"]["Player"].tolist()
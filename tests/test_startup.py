@@ -0,0 +1,12 @@
+"""Import-time regression test for the app's core path (see profile_startup.py)."""
+from profile_startup import DEFAULT_BUDGET, core_imports, profile_imports, total_import_time
+
+
+def test_core_path_has_no_heavy_imports_and_stays_within_budget():
+    statements = core_imports()
+    assert any("streamlit" in statement for statement in statements)
+
+    rows, loaded_heavy = profile_imports(statements)
+
+    assert loaded_heavy == []
+    assert total_import_time(rows) <= DEFAULT_BUDGET
@@ -0,0 +1,109 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from euroleague_analytics import COUNT_COLUMNS, underrated_players, validate_data
+
+
+def player(name, **stats):
+    """One valid row of raw statistics, with `stats` overriding the defaults."""
+    row = {column: 10 for column in COUNT_COLUMNS}
+    row.update({
+        "Player": f"{name}, EA7", "Position": "G", "Team": "EA7",
+        "Games_played": 10, "Minutes_played": 200, "Points": 100,
+        "Field_goals_made": 40, "Field_goals_attempted": 80,
+        "3_point_field_goals_made": 10, "3_point_field_goals_attempted": 30,
+        "Free_throws_made": 10, "Free_throws_attempted": 12,
+        "Assists": 20, "Turnovers": 10,
+    })
+    row.update(stats)
+    return row
+
+
+def test_missing_columns_raise():
+    raw = pd.DataFrame([player("A. Valid")]).drop(columns=["Turnovers", "Team"])
+    with pytest.raises(ValueError, match="Turnovers"):
+        validate_data(raw)
+
+
+def test_valid_rows_get_dtypes_and_finite_metrics():
+    result = validate_data(pd.DataFrame([player("A. Valid"), player("B. Valid", Points="80")]))
+
+    assert len(result.data) == 2
+    assert result.quarantined.empty
+    assert result.data["Points"].dtype == "int64"
+    assert result.data.loc[1, "Points"] == 80
+    assert np.isfinite(result.data[["Points_per_36_minutes", "Minutes_per_Game", "Value_to_Minutes"]]).all().all()
+    assert result.data.loc[0, "Points_per_36_minutes"] == pytest.approx(18.0)
+
+
+@pytest.mark.parametrize("stats, reason", [
+    ({"Points": "abc"}, "non-numeric Points"),
+    ({"Points": None}, "missing Points"),
+    ({"Team": "  "}, "missing Team"),
+    ({"Turnovers": -1}, "negative Turnovers"),
+    ({"Assists": 2.5}, "non-integer Assists"),
+    ({"Field_goals_made": 90}, "Field_goals_made > Field_goals_attempted"),
+    ({"Minutes_played": 0}, "no minutes played"),
+    ({"Games_played": 0}, "no games played"),
+    ({"Minutes_played": 700}, "more than 60 minutes per game"),
+])
+def test_invalid_rows_are_quarantined_with_reason(stats, reason):
+    result = validate_data(pd.DataFrame([player("A. Valid"), player("B. Invalid", **stats)]))
+
+    assert result.data["Player"].tolist() == ["A. Valid, EA7"]
+    assert result.quarantined["Player"].tolist() == ["B. Invalid, EA7"]
+    assert reason in result.quarantined["Quarantine_reason"].iloc[0]
+
+
+def test_duplicate_players_keep_the_first_row():
+    result = validate_data(pd.DataFrame([player("A. Valid"), player("A. Valid", Points=50)]))
+
+    assert result.data["Points"].tolist() == [100]
+    assert result.quarantined["Quarantine_reason"].tolist() == ["duplicate Player"]
+
+
+def test_multiple_reasons_are_joined():
+    result = validate_data(pd.DataFrame([player("B. Invalid", Turnovers=-1, Minutes_played=0)]))
+
+    assert result.quarantined["Quarantine_reason"].iloc[0] == "negative Turnovers; no minutes played"
+
+
+def test_zero_denominator_policies():
+    raw = pd.DataFrame([
+        player("A. Valid"),
+        player("B. No Shots", Field_goals_made=0, Field_goals_attempted=0, Points=0,
+               **{"3_point_field_goals_made": 0, "3_point_field_goals_attempted": 0}),
+        player("C. No Turnovers", Assists=15, Turnovers=0),
+    ])
+    result = validate_data(raw)
+    data = result.data.set_index("Player")
+
+    # Shooting percentages are undefined without attempts
+    assert np.isnan(data.loc["B. No Shots, EA7", "Effective_Field_Goal_Percentage"])
+    assert result.zero_denominators["Effective_Field_Goal_Percentage"] == 1
+
+    # Shot-profile rates are zero without attempts
+    assert data.loc["B. No Shots, EA7", "Three_point_attempt_rate"] == 0
+    assert data.loc["A. Valid, EA7", "Three_point_attempt_rate"] == pytest.approx(30 / 80)
+    assert result.zero_denominators["Free_throw_attempt_rate"] == 1
+
+    # AST/TOV is undefined without turnovers
+    assert np.isnan(data.loc["C. No Turnovers, EA7", "Assist_to_Turnover_Ratio"])
+    assert data.loc["A. Valid, EA7", "Assist_to_Turnover_Ratio"] == 2
+    assert result.zero_denominators["Assist_to_Turnover_Ratio"] == 1
+
+    assert not np.isinf(result.data.select_dtypes("number")).any().any()
+
+
+def test_players_without_turnovers_are_not_underrated():
+    # Low-sample player: 2 assists and no turnovers in 17 minutes
+    raw = pd.DataFrame([
+        player("A. Valid", Assists=30, Turnovers=10),
+        player("B. Low Sample", Minutes_played=17, Games_played=3, Points=8, Field_goals_made=3,
+               Field_goals_attempted=5, Free_throws_made=2, Free_throws_attempted=2, Assists=2, Turnovers=0,
+               **{"3_point_field_goals_made": 0, "3_point_field_goals_attempted": 1}),
+    ])
+    data = validate_data(raw).data
+
+    assert underrated_players(data)["Player"].tolist() == ["A. Valid, EA7"]